@@ -0,0 +1,145 @@
+"""
+분석 결과 캐시 모듈
+데이터셋 버전(최신 회차 + 내용 해시)과 규칙 명세별로
+analyze_history() 결과와 후보 풀을 프로세스 전체에서 한 번만 계산합니다.
+새 데이터셋이 이전 데이터셋에 회차를 덧붙인 것이면 이전 통계에 새 회차만 반영합니다.
+"""
+
+import threading
+from collections import OrderedDict
+
+from dataset import dataset_version
+from history_stats import HistoryStats
+from history_store import as_history
+from rule_engine import LottoRuleEngine
+from rule_spec import compile_rule_spec
+
+
+class AnalysisCache:
+    """(데이터셋 버전, 규칙 명세 해시) → 분석 결과 LRU 캐시 (스레드 안전)"""
+
+    def __init__(self, max_entries=16):
+        """
+        Args:
+            max_entries: 보관할 최대 항목 수
+        """
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._latest = {}  # 규칙 명세 해시 → (버전, HistoryStats, 분석 결과)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.full_builds = 0
+        self.incremental_updates = 0
+
+    def get(self, lotto_data, rule_spec=None, version=None):
+        """
+        분석 결과를 반환합니다. 캐시에 없으면 계산해서 저장합니다.
+
+        Args:
+            lotto_data: 로또 데이터 (DrawHistory 또는 레코드 리스트)
+            rule_spec: CompiledRuleSpec (없으면 기본 명세)
+            version: 데이터셋 버전 (없으면 내용으로 계산)
+
+        Returns:
+            dict: {
+                'core_numbers', 'last_week_numbers', 'exclude_numbers',
+                'candidate_pool', 'selectivity'
+            }
+        """
+        rule_spec = rule_spec or compile_rule_spec()
+        if version is None:
+            version = dataset_version(lotto_data)
+        key = (version, rule_spec.spec_hash)
+
+        with self._lock:
+            analysis = self._entries.get(key)
+            if analysis is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return analysis
+            self.misses += 1
+
+        # 잠금 밖에서 계산 (동시에 같은 키를 계산해도 결과는 같음)
+        history = as_history(lotto_data)
+        with self._lock:
+            previous = self._latest.get(rule_spec.spec_hash)
+
+        stats = _advance_stats(previous, history)
+        if stats is None:
+            self.full_builds += 1
+            stats = HistoryStats.from_history(history, rule_spec.candidates['recent_window'])
+        else:
+            self.incremental_updates += 1
+
+        engine = LottoRuleEngine(history, rule_spec=rule_spec)
+        engine.load_analysis(stats.analysis(rule_spec.candidates))
+        analysis = {
+            'core_numbers': engine.core_numbers,
+            'last_week_numbers': engine.last_week_numbers,
+            'exclude_numbers': engine.exclude_numbers,
+            'candidate_pool': engine.get_candidate_pool()
+        }
+
+        # 후보 풀이 그대로면 정확한 통과 개수도 그대로
+        if previous is not None and previous[2]['candidate_pool'] == analysis['candidate_pool']:
+            analysis['selectivity'] = previous[2]['selectivity']
+        else:
+            analysis['selectivity'] = engine.get_exact_selectivity()
+
+        with self._lock:
+            latest = self._latest.get(rule_spec.spec_hash)
+            if latest is None or latest[1].draw_count <= stats.draw_count:
+                self._latest[rule_spec.spec_hash] = (version, stats, analysis)
+            self._entries[key] = analysis
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+        return analysis
+
+    def clear(self):
+        """캐시를 비웁니다."""
+        with self._lock:
+            self._entries.clear()
+            self._latest.clear()
+
+    def info(self):
+        """캐시 상태를 반환합니다."""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'full_builds': self.full_builds,
+                'incremental_updates': self.incremental_updates
+            }
+
+
+def _advance_stats(previous, history):
+    """
+    이전 통계에 새로 덧붙은 회차만 반영합니다.
+
+    Args:
+        previous: (버전, HistoryStats, 분석 결과) 또는 None
+        history: 새 DrawHistory
+
+    Returns:
+        HistoryStats 또는 None (이전 데이터셋에 회차를 덧붙인 것이 아닐 때)
+    """
+    if previous is None:
+        return None
+
+    version, stats, _ = previous
+    if not 0 < stats.draw_count < len(history):
+        return None
+    if dataset_version(history.slice(0, stats.draw_count)) != version:
+        return None
+
+    for row in range(stats.draw_count, len(history)):
+        stats = stats.append(history.record(row))
+    return stats
+
+
+# 프로세스 전체 분석 캐시
+ANALYSIS_CACHE = AnalysisCache()
@@ -3,10 +3,12 @@ Flask API 서버
 로또 번호 조합 생성 및 데이터 제공 API
 """
 
-from flask import Flask, jsonify, request, send_from_directory
+from flask import Flask, Response, jsonify, request, send_from_directory, stream_with_context
 from flask_cors import CORS
 import json
+import os
 import sys
+import threading
 from pathlib import Path
 
 # 현재 디렉토리를 모듈 검색 경로에 추가
@@ -15,8 +17,19 @@ sys.path.append(str(Path(__file__).parent))
 from data_collector import LottoDataCollector
 from rule_engine import LottoRuleEngine
 from database import init_db, get_db_connection
-from auth import hash_password, verify_password, generate_token, token_required
-from result_checker import check_result
+from auth import hash_password, verify_password, generate_token, token_required, get_optional_user
+from settlement import settle_draw, settle_pending
+from result_checker import find_historical_wins
+from simulator import simulate
+from combination_index import FilterBitmap
+from filter_stats import GLOBAL_FILTER_STATS
+from rule_spec import compile_rule_spec, load_rule_profile
+from analysis_cache import ANALYSIS_CACHE
+from generation_cache import GenerationCache
+from combination_pool import CombinationPool
+from issued_filter import IssuedCombinations
+from dataset import LottoDataset
+from utils import get_window_frequencies
 
 app = Flask(__name__, static_folder='../frontend')
 CORS(app)  # 프론트엔드에서 접근 가능하도록 CORS 설정
@@ -25,27 +38,94 @@ CORS(app)  # 프론트엔드에서 접근 가능하도록 CORS 설정
 BASE_DIR = Path(__file__).parent
 DATA_DIR = BASE_DIR / '../data'
 
-def load_lotto_data():
-    """로또 데이터를 로드합니다."""
-    data_file = DATA_DIR / 'lotto_history.json'
+# 로또 데이터 (시작 시 한 번 읽고, 파일이 바뀌면 다시 읽음)
+DATASET = LottoDataset(DATA_DIR / 'lotto_history.json')
+DATASET.get()
+
+# 테넌트별 규칙 프로필 (<이름>.json 규칙 명세)
+RULE_PROFILES_DIR = DATA_DIR / 'rule_profiles'
+
+# 정적 필터 비트맵 (python combination_index.py 로 미리 생성, 없으면 직접 필터 평가)
+FILTER_BITMAP = FilterBitmap.load(DATA_DIR / 'filter_bitmap.bin')
+
+# 필터 평가 방식 ('python' 또는 'numpy'), 환경변수로 전환
+FILTER_ENGINE = os.environ.get('LOTTO_FILTER_ENGINE', 'python')
+
+# 조합 생성 방식 ('sample': 추출 후 필터링, 'search': 조건 탐색으로 직접 생성, 'sharded': 샤드별 병렬 생성)
+GENERATION_STRATEGY = os.environ.get('LOTTO_GENERATION_STRATEGY', 'sample')
+
+# 'sharded' 생성 방식의 프로세스 수
+GENERATION_WORKERS = int(os.environ.get('LOTTO_GENERATION_WORKERS', 1))
+
+# 최종 조합 선택 방식 ('first': 통과 순서대로, 'coverage': 번호 쌍/삼중 커버리지 최대화), 요청의 selection으로도 지정
+SELECTION_MODE = os.environ.get('LOTTO_SELECTION', 'first')
+
+# 시드를 지정한 생성 결과 캐시 (최대 항목 수, 0이면 사용 안 함)
+GENERATION_CACHE = GenerationCache(int(os.environ.get('LOTTO_GENERATION_CACHE_SIZE', 256)))
+
+# 미리 생성해 둔 조합 풀 (키마다 유지할 개수, 0이면 사용 안 함) - 시드 없는 'first' 선택 요청에 사용
+COMBINATION_POOL = CombinationPool(
+    target_size=int(os.environ.get('LOTTO_POOL_SIZE', 500)),
+    refill_batch=int(os.environ.get('LOTTO_POOL_REFILL_BATCH', 100)),
+    strategy=GENERATION_STRATEGY
+)
+
+# 사용자별 회차 발급/저장 조합 Bloom 필터 (로그인한 사용자에게 같은 조합을 다시 주지 않음)
+ISSUED_COMBINATIONS = IssuedCombinations()
+
+# 기대값 시뮬레이션 요청당 최대 추첨 횟수
+MAX_SIMULATION_DRAWS = int(os.environ.get('LOTTO_MAX_SIMULATION_DRAWS', 200_000))
+
+# 과거 당첨 조회·시뮬레이션 요청당 최대 조합 수 (조합 × 회차 배열 크기 제한)
+MAX_REQUEST_COMBINATIONS = int(os.environ.get('LOTTO_MAX_REQUEST_COMBINATIONS', 1000))
+
+# 규칙별 통계 기록 및 적응형 규칙 순서 ('1'이면 사용)
+COLLECT_FILTER_STATS = os.environ.get('LOTTO_FILTER_STATS') == '1'
+ADAPTIVE_RULE_ORDER = os.environ.get('LOTTO_ADAPTIVE_RULES') == '1'
+
+
+def create_engine(snapshot, profile=None):
+    """
+    설정값을 적용한 규칙 엔진을 생성합니다.
     
-    if not data_file.exists():
-        # 데이터가 없으면 수집
-        try:
-            collector = LottoDataCollector(data_dir=DATA_DIR)
-            data = collector.collect_recent_data(months=6)
-            collector.save_data(data)
-            return data
-        except Exception as e:
-            print(f"Data collection failed: {e}")
-            return []
+    Args:
+        snapshot: DatasetSnapshot (데이터와 버전)
+        profile: 규칙 프로필 이름 (없으면 기본 규칙)
+    
+    Raises:
+        ValueError: 알 수 없는 프로필일 때
+    """
+    rule_spec = load_rule_profile(profile, RULE_PROFILES_DIR)
+    
+    return LottoRuleEngine(
+        snapshot.history,
+        filter_bitmap=FILTER_BITMAP,
+        filter_engine=FILTER_ENGINE,
+        collect_stats=COLLECT_FILTER_STATS,
+        adaptive_order=ADAPTIVE_RULE_ORDER,
+        rule_spec=rule_spec,
+        workers=GENERATION_WORKERS,
+        analysis=ANALYSIS_CACHE.get(snapshot.history, rule_spec, version=snapshot.version)
+    )
+
+def load_lotto_data():
+    """로또 데이터를 반환합니다. (메모리에 둔 DrawHistory, 파일이 바뀌었을 때만 다시 읽음)"""
+    return DATASET.get().history
+
+
+def collect_initial_data():
+    """데이터 파일이 없으면 서버 시작 전에 수집합니다. (요청 처리 중에는 수집하지 않음)"""
+    if DATASET.data_file.exists():
+        return
     
     try:
-        with open(data_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        collector = LottoDataCollector(data_dir=DATA_DIR)
+        data = collector.collect_recent_data(months=6)
+        collector.save_data(data)
     except Exception as e:
-        print(f"Data load failed: {e}")
-        return []
+        print(f"Data collection failed: {e}")
+    
+    DATASET.reload()
 
 
 @app.route('/')
@@ -72,12 +152,16 @@ def generate_combinations():
     """로또 번호 조합을 생성합니다."""
     try:
         data = request.get_json() or {}
-        num_combinations = data.get('num_combinations', 10)
+        num_combinations = int(data.get('num_combinations', 10))
+        profile = data.get('profile')
+        selection = data.get('selection', SELECTION_MODE)
+        seed = _parse_seed(data.get('seed'))
         
-        lotto_data = load_lotto_data()
+        snapshot = DATASET.get()
+        history = snapshot.history
         
         # 데이터가 없으면 빈 결과 반환
-        if not lotto_data:
+        if not history:
              return jsonify({
                 'success': True,
                 'data': {
@@ -86,8 +170,48 @@ def generate_combinations():
                 }
             })
 
-        engine = LottoRuleEngine(lotto_data)
-        result = engine.generate_combinations(num_combinations=num_combinations)
+        engine = create_engine(snapshot, profile=profile)
+        
+        # 로그인한 사용자는 다음 회차에 이미 받았거나 저장한 조합을 제외 (시드 지정 요청은 결과를 고정하므로 제외 안 함)
+        user = get_optional_user()
+        target_draw = history.latest()['draw_number'] + 1
+        issued = None
+        if user is not None and seed is None:
+            issued = ISSUED_COMBINATIONS.get(user['user_id'], target_draw)
+        
+        # 시드가 있으면 결과가 정해지므로 캐시에서 바로 반환
+        cache_key = None
+        if seed is not None:
+            cache_key = GENERATION_CACHE.make_key(
+                snapshot.version, engine.rule_spec.spec_hash, GENERATION_STRATEGY,
+                selection, seed, num_combinations
+            )
+            cached = GENERATION_CACHE.get(cache_key)
+            if cached is not None:
+                _record_issued(user, target_draw, cached['combinations'])
+                return jsonify({'success': True, 'data': cached, 'cached': True})
+        
+        # 시드가 없으면 미리 생성해 둔 풀에서 꺼냄 (모자라면 아래에서 직접 생성)
+        if seed is None and selection == 'first' and COMBINATION_POOL.enabled:
+            # 이미 받은 조합은 건너뛰고 풀의 다음 조합으로 채움
+            pooled = COMBINATION_POOL.pop(
+                (snapshot.version, engine.rule_spec.spec_hash),
+                num_combinations,
+                lambda: create_engine(snapshot, profile=profile),
+                exclude=issued
+            )
+            if pooled is not None:
+                pooled['draw_number'] = target_draw
+                _record_issued(user, target_draw, pooled['combinations'])
+                return jsonify({'success': True, 'data': pooled})
+        
+        result = engine.generate_combinations(
+            num_combinations=num_combinations,
+            strategy=GENERATION_STRATEGY,
+            selection=selection,
+            seed=seed,
+            exclude=issued
+        )
         
         # 프론트엔드 형식을 위해 데이터 가공
         combinations_with_explanation = []
@@ -98,35 +222,152 @@ def generate_combinations():
             })
         
         result['combinations'] = combinations_with_explanation
+        result['statistics']['source'] = 'generated'
+        result['draw_number'] = target_draw
+        
+        if cache_key is not None:
+            GENERATION_CACHE.put(cache_key, result)
+        _record_issued(user, target_draw, combinations_with_explanation)
         
         return jsonify({
             'success': True,
             'data': result
         })
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
     except Exception as e:
         print(f"Generate Error: {str(e)}")
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
+def _record_issued(user, draw_number, combinations):
+    """로그인한 사용자에게 준 조합을 발급 필터에 기록합니다. (실패해도 응답은 그대로 보냄)"""
+    if user is None or not combinations:
+        return
+    try:
+        ISSUED_COMBINATIONS.add(user['user_id'], draw_number, [item['numbers'] for item in combinations])
+    except Exception as e:
+        print(f"Issued filter update failed: {e}")
+
+
+def _parse_seed(value):
+    """
+    요청의 seed 값을 정수로 변환합니다.
+    
+    Raises:
+        ValueError: 정수가 아닐 때
+    """
+    if value is None:
+        return None
+    try:
+        if isinstance(value, bool) or not isinstance(value, (int, str)):
+            raise ValueError
+        return int(value)
+    except ValueError:
+        raise ValueError('seed는 정수여야 합니다') from None
+
+
+def _stream_event(event, sse=False):
+    """스트리밍 이벤트 하나를 NDJSON 한 줄 또는 SSE 메시지로 직렬화합니다."""
+    payload = json.dumps(event, ensure_ascii=False)
+    if sse:
+        return f"event: {event['type']}\ndata: {payload}\n\n"
+    return payload + '\n'
+
+
+@app.route('/api/generate/stream', methods=['POST'])
+def generate_combinations_stream():
+    """
+    로또 번호 조합을 필터를 통과하는 즉시 하나씩 보냅니다.
+    기본은 NDJSON, Accept: text/event-stream 또는 ?format=sse 이면 Server-Sent Events.
+    이벤트: combination (index, numbers, explanation) 여러 개, 마지막에 summary
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        num_combinations = int(data.get('num_combinations', 10))
+        profile = data.get('profile')
+        seed = _parse_seed(data.get('seed'))
+        sse = (request.args.get('format') == 'sse'
+               or 'text/event-stream' in request.headers.get('Accept', ''))
+        
+        snapshot = DATASET.get()
+        # 잘못된 프로필 등은 스트리밍 시작 전에 400으로 응답
+        engine = create_engine(snapshot, profile=profile) if snapshot.history else None
+        
+        # 로그인한 사용자는 다음 회차에 이미 받았거나 저장한 조합을 제외
+        user = get_optional_user() if engine is not None else None
+        target_draw = snapshot.history.latest()['draw_number'] + 1 if engine is not None else None
+        issued = None
+        if user is not None and seed is None:
+            issued = ISSUED_COMBINATIONS.get(user['user_id'], target_draw)
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        print(f"Generate Stream Error: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+    
+    def events():
+        statistics = {}
+        sent = []
+        try:
+            if engine is not None:
+                combos = engine.iter_combinations(
+                    num_combinations=num_combinations,
+                    strategy=GENERATION_STRATEGY,
+                    statistics=statistics,
+                    seed=seed,
+                    exclude=issued
+                )
+                for index, combo in enumerate(combos):
+                    sent.append({'numbers': combo})
+                    yield _stream_event({
+                        'type': 'combination',
+                        'index': index,
+                        'numbers': combo,
+                        'explanation': engine.explain_combination(combo)
+                    }, sse)
+            
+            _record_issued(user, target_draw, sent)
+            yield _stream_event({
+                'type': 'summary',
+                'draw_number': target_draw,
+                'core_numbers': engine.core_numbers if engine else [],
+                'last_week_numbers': engine.last_week_numbers if engine else [],
+                'exclude_numbers': engine.exclude_numbers if engine else [],
+                'statistics': statistics
+            }, sse)
+        except Exception as e:
+            print(f"Generate Stream Error: {str(e)}")
+            yield _stream_event({'type': 'error', 'error': str(e)}, sse)
+    
+    return Response(
+        stream_with_context(events()),
+        mimetype='text/event-stream' if sse else 'application/x-ndjson',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+
 @app.route('/api/statistics', methods=['GET'])
 def get_statistics():
     """통계 정보를 반환합니다."""
     try:
-        lotto_data = load_lotto_data()
+        profile = request.args.get('profile')
+        snapshot = DATASET.get()
+        history = snapshot.history
         
-        if not lotto_data:
+        if not history:
              return jsonify({
                 'success': True,
                 'data': {
                     'core_numbers': [],
                     'last_week_numbers': [],
                     'exclude_numbers': [],
-                    'total_draws': 0
+                    'total_draws': 0,
+                    'selectivity': None
                 }
             })
 
-        engine = LottoRuleEngine(lotto_data)
-        engine.analyze_history()
+        engine = create_engine(snapshot, profile=profile)
         
         return jsonify({
             'success': True,
@@ -134,14 +375,150 @@ def get_statistics():
                 'core_numbers': sorted(list(engine.core_numbers)),
                 'last_week_numbers': engine.last_week_numbers,
                 'exclude_numbers': sorted(list(engine.exclude_numbers)),
-                'total_draws': len(lotto_data)
+                'total_draws': len(history),
+                'selectivity': engine.get_exact_selectivity()
             }
         })
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
     except Exception as e:
         print(f"Statistics Error: {str(e)}")
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
+@app.route('/api/frequency', methods=['GET'])
+def get_frequency():
+    """최근 회차 구간별 번호 빈도 벡터를 반환합니다. (?windows=10,26,52,all&bonus=1)"""
+    try:
+        windows = []
+        for value in request.args.get('windows', '10,26,52,all').split(','):
+            value = value.strip()
+            if value == 'all':
+                windows.append(None)
+            elif value.isdigit() and int(value) > 0:
+                windows.append(int(value))
+            else:
+                raise ValueError(f"Invalid window: {value}")
+        include_bonus = request.args.get('bonus', '1') != '0'
+        
+        history = DATASET.get().history
+        
+        return jsonify({
+            'success': True,
+            'data': {
+                'total_draws': len(history),
+                'include_bonus': include_bonus,
+                'frequencies': get_window_frequencies(history, windows=windows, include_bonus=include_bonus)
+            }
+        })
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        print(f"Frequency Error: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@app.route('/api/history-matches', methods=['POST'])
+def get_history_matches():
+    """조합이 과거 회차에서 3개 이상 맞춘 회차와 등수를 반환합니다. (numbers 또는 combinations)"""
+    try:
+        data = request.get_json() or {}
+        combinations = data.get('combinations') or ([data['numbers']] if data.get('numbers') else [])
+        min_matches = int(data.get('min_matches', 3))
+        
+        if not combinations:
+            return jsonify({'success': False, 'error': '번호가 필요합니다'}), 400
+        if len(combinations) > MAX_REQUEST_COMBINATIONS:
+            return jsonify({
+                'success': False, 'error': f'조합은 최대 {MAX_REQUEST_COMBINATIONS}개까지 조회할 수 있습니다'
+            }), 400
+        if not 1 <= min_matches <= 6:
+            return jsonify({'success': False, 'error': 'min_matches는 1-6 사이여야 합니다'}), 400
+        
+        wins = find_historical_wins(combinations, load_lotto_data(), min_matches=min_matches)
+        
+        return jsonify({
+            'success': True,
+            'data': [
+                {'numbers': numbers, 'matches': matches}
+                for numbers, matches in zip(combinations, wins)
+            ]
+        })
+    except (ValueError, TypeError) as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        print(f"History Matches Error: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@app.route('/api/simulate', methods=['POST'])
+def simulate_combinations():
+    """조합 묶음의 등수별 확률과 기대 당첨금을 몬테카를로로 추정합니다."""
+    try:
+        data = request.get_json() or {}
+        combinations = data.get('combinations') or []
+        draws = min(int(data.get('draws', 100_000)), MAX_SIMULATION_DRAWS)
+        
+        if not combinations or draws < 1:
+            return jsonify({'success': False, 'error': '조합과 추첨 횟수가 필요합니다'}), 400
+        if len(combinations) > MAX_REQUEST_COMBINATIONS:
+            return jsonify({
+                'success': False, 'error': f'조합은 최대 {MAX_REQUEST_COMBINATIONS}개까지 시뮬레이션할 수 있습니다'
+            }), 400
+        if any(len(c) != 6 or len(set(c)) != 6 or min(c) < 1 or max(c) > 45 for c in combinations):
+            return jsonify({'success': False, 'error': '번호는 1-45 사이의 서로 다른 6개여야 합니다'}), 400
+        
+        return jsonify({
+            'success': True,
+            'data': simulate(combinations, draws=draws, seed=data.get('seed'))
+        })
+    except (ValueError, TypeError) as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        print(f"Simulate Error: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@app.route('/api/debug/filter-stats', methods=['GET'])
+def get_filter_stats():
+    """규칙별 누적 평가/탈락 통계를 반환합니다. (LOTTO_FILTER_STATS=1 일 때 기록)"""
+    try:
+        rules = compile_rule_spec().rules
+        return jsonify({
+            'success': True,
+            'data': {
+                'enabled': COLLECT_FILTER_STATS or ADAPTIVE_RULE_ORDER,
+                'adaptive_order': ADAPTIVE_RULE_ORDER,
+                # 통계를 기록하면 규칙을 직접 평가하므로 비트맵 조회는 사용하지 않음
+                'filter_bitmap_active': FILTER_BITMAP is not None
+                                        and not (COLLECT_FILTER_STATS or ADAPTIVE_RULE_ORDER),
+                'rule_order': [name for name, _ in GLOBAL_FILTER_STATS.order_rules(rules)]
+                              if ADAPTIVE_RULE_ORDER else [name for name, _ in rules],
+                'rules': GLOBAL_FILTER_STATS.snapshot()
+            }
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@app.route('/api/debug/combination-pool', methods=['GET'])
+def get_combination_pool_info():
+    """미리 생성한 조합 풀의 깊이와 채우기 통계를 반환합니다."""
+    return jsonify({'success': True, 'data': COMBINATION_POOL.info()})
+
+
+@app.route('/api/debug/generation-cache', methods=['GET'])
+def get_generation_cache_info():
+    """시드 지정 생성 결과 캐시와 분석 결과 캐시 상태를 반환합니다."""
+    return jsonify({
+        'success': True,
+        'data': {
+            'generation': GENERATION_CACHE.info(),
+            'analysis': ANALYSIS_CACHE.info()
+        }
+    })
+
+
 # ===== 인증 API =====
 
 @app.route('/api/auth/signup', methods=['POST'])
@@ -263,6 +640,12 @@ def save_combination(current_user):
         conn.commit()
         conn.close()
         
+        # 저장한 조합은 다음 생성부터 제외 (실패해도 저장은 끝났으므로 기록만 남김)
+        try:
+            ISSUED_COMBINATIONS.add(current_user['user_id'], draw_number, [numbers])
+        except Exception as e:
+            print(f"Issued filter update failed: {e}")
+        
         return jsonify({'success': True, 'saved_id': saved_id, 'message': '번호가 저장되었습니다'}), 201
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
@@ -308,6 +691,31 @@ def get_my_combinations(current_user):
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
+@app.route('/api/combinations/my/history-matches', methods=['GET'])
+@token_required
+def get_my_history_matches(current_user):
+    """내 저장된 조합 전체의 과거 회차 당첨 이력 (3개 이상 일치)"""
+    try:
+        conn = get_db_connection()
+        combinations = conn.execute(
+            'SELECT id, numbers FROM saved_combinations WHERE user_id = ? ORDER BY created_at DESC',
+            (current_user['user_id'],)
+        ).fetchall()
+        conn.close()
+        
+        numbers = [json.loads(combo['numbers']) for combo in combinations]
+        wins = find_historical_wins(numbers, load_lotto_data())
+        
+        result = [
+            {'id': combo['id'], 'numbers': nums, 'matches': matches}
+            for combo, nums, matches in zip(combinations, numbers, wins)
+        ]
+        
+        return jsonify({'success': True, 'combinations': result})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
 @app.route('/api/combinations/<int:combination_id>', methods=['DELETE'])
 @token_required
 def delete_combination(current_user, combination_id):
@@ -393,8 +801,17 @@ def check_results(current_user):
         if not draw_number:
             return jsonify({'success': False, 'error': '회차 번호가 필요합니다'}), 400
         
-        lotto_data = load_lotto_data()
-        winning_draw = next((d for d in lotto_data if d['draw_number'] == draw_number), None)
+        # True, 12.7 같은 값은 int()가 조용히 바꾸므로 정수와 정수 문자열만 허용
+        if isinstance(draw_number, bool) or not isinstance(draw_number, (int, str)):
+            return jsonify({'success': False, 'error': '회차 번호는 정수여야 합니다'}), 400
+        try:
+            draw_number = int(draw_number)
+        except ValueError:
+            return jsonify({'success': False, 'error': '회차 번호는 정수여야 합니다'}), 400
+        
+        # 회차 번호 인덱스로 O(1) 조회
+        history = load_lotto_data()
+        winning_draw = history.get(draw_number)
         
         if not winning_draw:
             return jsonify({'success': False, 'error': '해당 회차의 당첨 번호를 찾을 수 없습니다'}), 404
@@ -403,42 +820,36 @@ def check_results(current_user):
         bonus_number = winning_draw['bonus_number']
         
         conn = get_db_connection()
-        cursor = conn.cursor()
         
-        # 해당 회차의 사용자 조합 조회
-        cursor.execute(
+        # 정산 작업이 아직 처리하지 않은 조합이 있으면 이 사용자의 조합만 먼저 정산
+        # (다른 사용자의 조합은 정산 작업이 처리)
+        pending = conn.execute(
+            'SELECT 1 FROM saved_combinations WHERE user_id = ? AND draw_number = ? AND checked = 0 LIMIT 1',
+            (current_user['user_id'], draw_number)
+        ).fetchone()
+        if pending:
+            settle_draw(draw_number, history, conn=conn, user_id=current_user['user_id'])
+        
+        # 정산된 결과 조회
+        combinations = conn.execute(
             'SELECT * FROM saved_combinations WHERE user_id = ? AND draw_number = ?',
             (current_user['user_id'], draw_number)
-        )
-        combinations = cursor.fetchall()
+        ).fetchall()
+        conn.close()
         
+        winning_set = set(winning_numbers)
         results = []
         for combo in combinations:
             saved_numbers = json.loads(combo['numbers'])
-            result = check_result(saved_numbers, winning_numbers, bonus_number)
-            
-            # 결과 업데이트
-            cursor.execute(
-                '''
-                UPDATE saved_combinations 
-                SET checked = 1, matched_count = ?, prize = ? 
-                WHERE id = ?
-                ''',
-                (result['matched_count'], result['prize'], combo['id'])
-            )
-            
             results.append({
                 'combination_id': combo['id'],
                 'numbers': saved_numbers,
-                'matched_count': result['matched_count'],
-                'matched_numbers': result['matched_numbers'],
-                'has_bonus': result['has_bonus'],
-                'prize': result['prize']
+                'matched_count': combo['matched_count'],
+                'matched_numbers': [n for n in saved_numbers if n in winning_set],
+                'has_bonus': bonus_number in saved_numbers,
+                'prize': combo['prize']
             })
         
-        conn.commit()
-        conn.close()
-        
         return jsonify({
             'success': True,
             'winning_numbers': winning_numbers,
@@ -453,9 +864,23 @@ if __name__ == '__main__':
     # 데이터 디렉토리 생성
     DATA_DIR.mkdir(exist_ok=True)
     
+    # 데이터가 없으면 시작 전에 수집
+    collect_initial_data()
+    
     # 데이터베이스 초기화
     init_db()
     
+    # 밀린 회차 정산 (백그라운드)
+    threading.Thread(target=settle_pending, args=(load_lotto_data(),), daemon=True).start()
+    
+    # 기본 규칙의 조합 풀 미리 채우기 (백그라운드)
+    snapshot = DATASET.get()
+    if COMBINATION_POOL.enabled and snapshot.history:
+        COMBINATION_POOL.warm(
+            (snapshot.version, compile_rule_spec().spec_hash),
+            lambda: create_engine(snapshot)
+        )
+    
     print("=" * 60)
     print("🎯 골프친구-독식 로또 예측 시스템 서버 시작")
     print("=" * 60)
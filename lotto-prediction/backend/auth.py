@@ -89,6 +89,19 @@ def verify_token(token: str) -> dict:
         return None  # 유효하지 않은 토큰
 
 
+def get_optional_user():
+    """
+    Authorization 헤더에 유효한 토큰이 있으면 페이로드를 반환합니다. (로그인이 선택인 API용)
+    
+    Returns:
+        페이로드 딕셔너리 또는 None (토큰이 없거나 유효하지 않을 때)
+    """
+    parts = request.headers.get('Authorization', '').split(' ')
+    if len(parts) != 2 or not parts[1]:
+        return None
+    return verify_token(parts[1])
+
+
 def token_required(f):
     """
     API 엔드포인트에 토큰 인증을 요구하는 데코레이터
@@ -0,0 +1,218 @@
+"""
+과거 회차 백테스트 모듈
+각 회차 d에 대해 d 이전 회차만으로 엔진 상태를 다시 만들고 조합을 생성한 뒤,
+result_checker의 등수 판정으로 회차 d와 비교합니다.
+채점은 모든 회차와 조합을 한 번에 배열 연산으로 처리합니다.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+from bitmask import to_mask, to_mask_array
+from combination_index import TOTAL_COMBINATIONS, all_combinations_array, unrank_array
+from history_store import as_history
+from result_checker import PRIZE_NAMES, check_results_bulk
+from rule_engine import LottoRuleEngine
+from rule_spec import compile_rule_spec
+
+# 통과 조합을 큰 번호 몇 개로 묶어 후보 풀 부분집합 검사를 묶음 단위로 건너뜀
+# (colex 순서에서는 큰 번호 4개가 같은 조합이 연속으로 놓임)
+GROUP_SUFFIX = 4
+
+_MASK64 = (1 << 64) - 1
+
+
+@lru_cache(maxsize=4)
+def _passing_combinations(rule_spec, filter_bitmap=None):
+    """
+    전체 45C6 조합 중 규칙을 통과하는 조합을 colex 순서로 계산합니다.
+    (규칙 통과 여부는 회차와 무관하므로 명세마다 한 번만 계산)
+
+    Args:
+        rule_spec: CompiledRuleSpec
+        filter_bitmap: 같은 명세로 만든 FilterBitmap (있으면 필터 대신 비트맵의 통과 순위를 복원)
+
+    Returns:
+        (통과 조합 (P, 6) 배열, 비트마스크 (P,) uint64 배열,
+         묶음 시작 위치 (G,), 묶음 크기 (G,), 묶음의 큰 번호 비트마스크 (G,) uint64) 튜플
+    """
+    if filter_bitmap is not None and filter_bitmap.spec_hash == rule_spec.spec_hash:
+        bits = np.unpackbits(np.frombuffer(filter_bitmap.bits, dtype=np.uint8),
+                             count=TOTAL_COMBINATIONS, bitorder='little')
+        combos = unrank_array(np.flatnonzero(bits)).astype(np.uint8)
+    else:
+        arr = all_combinations_array(order='colex')
+        combos = arr[rule_spec.vectorized(arr)]
+
+    suffix = combos[:, -GROUP_SUFFIX:]
+    changed = np.ones(len(combos), dtype=bool)
+    changed[1:] = (suffix[1:] != suffix[:-1]).any(axis=1)
+    starts = np.flatnonzero(changed)
+    counts = np.diff(np.append(starts, len(combos)))
+
+    return combos, to_mask_array(combos), starts, counts, to_mask_array(suffix[starts])
+
+
+def generate_tickets(engine, count, rng, filter_bitmap=None):
+    """
+    엔진의 후보 풀과 규칙으로 필터를 통과하는 조합을 count개까지 생성합니다.
+    미리 계산한 통과 조합 중 후보 풀에 속한 것((mask & ~pool_mask) == 0)만 남겨 중복 없이 고릅니다.
+
+    Args:
+        engine: 분석이 끝난 LottoRuleEngine
+        count: 생성할 조합 수
+        rng: numpy Generator
+        filter_bitmap: 같은 명세로 만든 FilterBitmap (선택)
+
+    Returns:
+        (K, 6) int16 배열 (K ≤ count)
+    """
+    pool = engine.get_candidate_pool()
+    if len(pool) < 6:
+        return np.zeros((0, 6), dtype=np.int16)
+
+    combos, masks, starts, counts, group_masks = _passing_combinations(engine.rule_spec, filter_bitmap)
+    outside = np.uint64(~to_mask(pool) & _MASK64)
+
+    # 큰 번호가 모두 풀 안에 있는 묶음만 펼쳐 나머지 번호를 검사
+    groups = np.flatnonzero((group_masks & outside) == 0)
+    sizes = counts[groups]
+    rows = np.repeat(starts[groups] - (np.cumsum(sizes) - sizes), sizes) + np.arange(sizes.sum())
+    valid = rows[(masks[rows] & outside) == 0]
+
+    if len(valid) > count:
+        valid = valid[rng.choice(len(valid), size=count, replace=False)]
+    return combos[valid].astype(np.int16)
+
+
+def score_tickets(history, rows, tickets):
+    """
+    조합들을 각각의 대상 회차와 비교해 맞춘 개수, 보너스 여부, 등수를 계산합니다.
+
+    Args:
+        history: DrawHistory
+        rows: 조합별 대상 회차의 행 인덱스 (T,)
+        tickets: 조합 배열 (T, 6)
+
+    Returns:
+        (맞춘 개수 (T,), 보너스 여부 (T,), 등수 인덱스 (T,)) 튜플
+    """
+    result = check_results_bulk(tickets, history.winning_numbers[rows], history.bonus_numbers[rows])
+    return result['matched_count'], result['has_bonus'], result['prize_tier']
+
+
+def run_backtest(lotto_data, tickets=1000, lookback=26, min_history=10, rule_spec=None, seed=None, filter_bitmap=None):
+    """
+    전체 기록에 대해 백테스트를 실행합니다.
+
+    Args:
+        lotto_data: 로또 데이터 (DrawHistory 또는 레코드 리스트)
+        tickets: 회차별 생성할 조합 수
+        lookback: 엔진 상태를 만들 때 사용할 직전 회차 수 (약 6개월 = 26회차)
+        min_history: 백테스트를 시작하기 위한 최소 직전 회차 수
+        rule_spec: CompiledRuleSpec (없으면 기본 명세)
+        seed: 난수 시드 (같은 시드면 같은 결과)
+        filter_bitmap: 같은 명세로 만든 FilterBitmap (있으면 통과 조합 계산에 사용)
+
+    Returns:
+        dict: {
+            'draws': [{'draw_number', 'tickets', 'prizes', 'best_prize'}, ...],
+            'summary': {'draws', 'tickets', 'prizes', 'match_distribution', 'hit_rate'}
+        }
+    """
+    history = as_history(lotto_data)
+    rule_spec = rule_spec or compile_rule_spec()
+    rng = np.random.default_rng(seed)
+
+    target_rows = list(range(min_history, len(history)))
+    blocks = []
+    for row in target_rows:
+        # 대상 회차 이전 기록만으로 분석
+        engine = LottoRuleEngine(history.slice(max(0, row - lookback), row), rule_spec=rule_spec)
+        engine.analyze_history()
+        blocks.append(generate_tickets(engine, tickets, rng, filter_bitmap=filter_bitmap))
+
+    counts = np.array([len(block) for block in blocks], dtype=np.int64)
+    all_tickets = np.concatenate(blocks) if blocks else np.zeros((0, 6), dtype=np.int16)
+    positions = np.repeat(np.arange(len(target_rows)), counts)
+    rows = np.asarray(target_rows, dtype=np.int64)[positions]
+
+    matched, _, tiers = score_tickets(history, rows, all_tickets)
+
+    # 회차별 등수 집계 (회차 위치 × 등수)
+    tally = np.bincount(positions * len(PRIZE_NAMES) + tiers,
+                        minlength=len(target_rows) * len(PRIZE_NAMES)).reshape(-1, len(PRIZE_NAMES))
+
+    draws = []
+    for pos, row in enumerate(target_rows):
+        won = [tier for tier in range(1, len(PRIZE_NAMES)) if tally[pos, tier]]
+        draws.append({
+            'draw_number': int(history.draw_numbers[row]),
+            'tickets': int(counts[pos]),
+            'prizes': {PRIZE_NAMES[tier]: int(tally[pos, tier]) for tier in range(1, len(PRIZE_NAMES))},
+            'best_prize': PRIZE_NAMES[won[0]] if won else None
+        })
+
+    total = tally.sum(axis=0)
+    return {
+        'draws': draws,
+        'summary': {
+            'draws': len(target_rows),
+            'tickets': int(counts.sum()),
+            'prizes': {PRIZE_NAMES[tier]: int(total[tier]) for tier in range(1, len(PRIZE_NAMES))},
+            'match_distribution': np.bincount(matched, minlength=7).tolist(),
+            'hit_rate': f"{total[1:].sum() / max(1, counts.sum()) * 100:.2f}%"
+        }
+    }
+
+
+def main():
+    """백테스트 실행 (python backtest.py --tickets 1000 --lookback 26)"""
+    import argparse
+    import time
+    from pathlib import Path
+
+    from combination_index import FilterBitmap
+    from dataset import LottoDataset
+    from rule_spec import load_rule_profile
+
+    data_dir = Path(__file__).parent / '../data'
+
+    parser = argparse.ArgumentParser(description='규칙 백테스트')
+    parser.add_argument('--tickets', type=int, default=1000, help='회차별 생성할 조합 수')
+    parser.add_argument('--lookback', type=int, default=26, help='분석에 사용할 직전 회차 수')
+    parser.add_argument('--min-history', type=int, default=10, help='시작에 필요한 최소 직전 회차 수')
+    parser.add_argument('--profile', default=None, help='규칙 프로필 이름')
+    parser.add_argument('--seed', type=int, default=None, help='난수 시드')
+    parser.add_argument('--per-draw', action='store_true', help='회차별 결과 출력')
+    args = parser.parse_args()
+
+    history = LottoDataset(data_dir / 'lotto_history.json').get().history
+    if not len(history):
+        print("Error: lotto_history.json not found. Run data_collector.py first.")
+        return
+
+    rule_spec = load_rule_profile(args.profile, data_dir / 'rule_profiles')
+
+    start = time.time()
+    result = run_backtest(history, tickets=args.tickets, lookback=args.lookback,
+                          min_history=args.min_history, rule_spec=rule_spec, seed=args.seed,
+                          filter_bitmap=FilterBitmap.load(data_dir / 'filter_bitmap.bin'))
+    elapsed = time.time() - start
+
+    if args.per_draw:
+        for draw in result['draws']:
+            prizes = ', '.join(f"{name} {n}" for name, n in draw['prizes'].items() if n)
+            print(f"  {draw['draw_number']}회: {draw['tickets']}장 - {prizes or '낙첨'}")
+
+    summary = result['summary']
+    print(f"\n📊 백테스트 결과 ({summary['draws']}회차, {summary['tickets']:,}장, {elapsed:.2f}s)")
+    for name, n in summary['prizes'].items():
+        print(f"  - {name}: {n:,}")
+    print(f"  - 맞춘 개수 분포 (0-6개): {summary['match_distribution']}")
+    print(f"  - 당첨률: {summary['hit_rate']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""
+비트마스크 조합 표현 모듈
+6개 번호 조합을 64비트 정수 하나로 표현합니다. (i번 비트 = i번 번호)
+일치 개수는 popcount(a & b), 중복 제거는 정수 집합 조회로 처리합니다.
+배열 버전(to_mask_array, popcount_array)은 uint64 배열로 여러 조합을 한 번에 처리합니다.
+"""
+
+import numpy as np
+
+try:
+    popcount = int.bit_count
+except AttributeError:  # Python 3.10 미만
+    def popcount(x):
+        """설정된 비트 수를 셉니다."""
+        return bin(x).count('1')
+
+
+def to_mask(numbers):
+    """
+    번호 리스트를 비트마스크로 변환합니다.
+
+    Args:
+        numbers: 번호 리스트 [1, 2, 3, 4, 5, 6]
+
+    Returns:
+        정수 비트마스크
+    """
+    mask = 0
+    for n in numbers:
+        mask |= 1 << n
+    return mask
+
+
+def range_mask(low, high):
+    """low 이상 high 이하 번호가 모두 설정된 마스크를 반환합니다."""
+    return ((1 << (high + 1)) - 1) ^ ((1 << low) - 1)
+
+
+# 규칙 검사용 사전 계산 마스크
+ODD_MASK = to_mask(range(1, 46, 2))
+MULTIPLE_OF_THREE_MASK = to_mask(range(3, 46, 3))
+
+# 로또 용지의 인접한 두 열 (열: 1-9, 10-19, 20-29, 30-39, 40-45)
+ADJACENT_COLUMN_MASKS = [range_mask(1, 19), range_mask(10, 29), range_mask(20, 39), range_mask(30, 45)]
+
+# 바이트 단위 합계 조회 테이블: SUM_TABLES[j][b] = 바이트 j의 값 b에 해당하는 번호 합
+SUM_TABLES = [
+    [sum(8 * j + bit for bit in range(8) if b >> bit & 1) for b in range(256)]
+    for j in range(6)
+]
+
+
+def mask_sum(mask):
+    """비트마스크 번호의 합계를 계산합니다."""
+    return (
+        SUM_TABLES[0][mask & 0xFF] + SUM_TABLES[1][mask >> 8 & 0xFF]
+        + SUM_TABLES[2][mask >> 16 & 0xFF] + SUM_TABLES[3][mask >> 24 & 0xFF]
+        + SUM_TABLES[4][mask >> 32 & 0xFF] + SUM_TABLES[5][mask >> 40 & 0xFF]
+    )
+
+
+def to_mask_array(combinations):
+    """
+    조합 배열을 uint64 비트마스크 배열로 변환합니다.
+
+    Args:
+        combinations: (N, k) 번호 배열 또는 (N,) 비트마스크 배열
+
+    Returns:
+        (N,) uint64 배열
+    """
+    arr = np.asarray(combinations)
+    if arr.ndim == 1:
+        return arr.astype(np.uint64)
+    return np.bitwise_or.reduce(np.left_shift(np.uint64(1), arr.astype(np.uint64)), axis=1)
+
+
+if hasattr(np, 'bitwise_count'):
+    def popcount_array(masks):
+        """uint64 배열 각 원소의 설정된 비트 수를 셉니다."""
+        return np.bitwise_count(masks)
+else:  # NumPy 2.0 미만
+    _BYTE_POPCOUNT = np.array([popcount(b) for b in range(256)], dtype=np.uint8)
+
+    def popcount_array(masks):
+        """uint64 배열 각 원소의 설정된 비트 수를 셉니다."""
+        masks = np.ascontiguousarray(masks, dtype=np.uint64)
+        return _BYTE_POPCOUNT[masks.view(np.uint8)].reshape(-1, 8).sum(axis=1, dtype=np.uint8).reshape(masks.shape)
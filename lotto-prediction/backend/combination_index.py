@@ -0,0 +1,293 @@
+"""
+전체 조합 공간(45C6) 인덱스 모듈
+조합 수 체계(combinatorial number system)로 조합을 순위화하고,
+정적 필터 통과 여부를 비트 배열로 미리 계산해 둡니다.
+"""
+
+import itertools
+import random
+import struct
+from math import comb
+from pathlib import Path
+
+import numpy as np
+
+from rule_spec import compile_rule_spec
+
+# 로또 번호 범위와 조합 크기
+MAX_NUMBER = 45
+PICK_COUNT = 6
+TOTAL_COMBINATIONS = comb(MAX_NUMBER, PICK_COUNT)  # 8,145,060
+
+# 비트맵 파일 헤더: 매직(4바이트) + 포맷 버전(uint16) + 조합 수(uint32) + 규칙 명세 해시(32바이트)
+BITMAP_MAGIC = b'LTFB'
+BITMAP_VERSION = 2
+BITMAP_HEADER = struct.Struct('<4sHI32s')
+
+DEFAULT_BITMAP_FILE = Path(__file__).parent / '../data/filter_bitmap.bin'
+
+# RANK_TABLE[n, i] = C(n - 1, i) : 배열 단위 순위 계산용
+RANK_TABLE = np.array(
+    [[comb(n - 1, i) if n > 0 else 0 for i in range(PICK_COUNT + 1)] for n in range(MAX_NUMBER + 1)],
+    dtype=np.int64
+)
+
+
+def rank_combination(numbers):
+    """
+    조합의 순위(colex 순서)를 계산합니다.
+
+    Args:
+        numbers: 1부터 시작하는 번호 리스트
+
+    Returns:
+        0 ~ C(45, 6)-1 범위의 순위
+    """
+    rank = 0
+    for i, n in enumerate(sorted(numbers), start=1):
+        rank += comb(n - 1, i)
+    return rank
+
+
+def unrank_combination(rank, k=PICK_COUNT):
+    """
+    순위로부터 조합을 복원합니다. (rank_combination의 역함수)
+
+    Args:
+        rank: 조합 순위
+        k: 조합 크기
+
+    Returns:
+        오름차순으로 정렬된 번호 리스트 (1부터 시작)
+    """
+    numbers = []
+
+    for i in range(k, 0, -1):
+        # comb(c, i) <= rank 를 만족하는 가장 큰 c 찾기
+        c = i - 1
+        while comb(c + 1, i) <= rank:
+            c += 1
+        rank -= comb(c, i)
+        numbers.append(c + 1)
+
+    numbers.reverse()
+    return numbers
+
+
+def _sample_ranks(total, count, rng):
+    """Floyd 알고리즘으로 [0, total)에서 서로 다른 순위 count개를 뽑아 섞습니다."""
+    ranks = set()
+    for j in range(total - count, total):
+        t = rng.randrange(j + 1)
+        ranks.add(j if t in ranks else t)
+
+    ranks = list(ranks)
+    rng.shuffle(ranks)
+    return ranks
+
+
+def sample_combinations(candidates, count, k=PICK_COUNT, rng=random):
+    """
+    후보 번호에서 서로 다른 k개 조합을 count개 균등 추출합니다.
+    전체 조합을 만들지 않고 Floyd 알고리즘으로 순위를 뽑아 복원하므로
+    메모리와 시간이 후보 공간 크기가 아닌 count에 비례합니다.
+
+    Args:
+        candidates: 후보 번호 리스트
+        count: 추출할 조합 수
+        k: 조합 크기
+        rng: 난수 생성기 (random 모듈 또는 random.Random 객체)
+
+    Returns:
+        조합(튜플) 리스트. 전체 조합 수가 count 이하이면 모든 조합
+    """
+    if comb(len(candidates), k) <= count:
+        return list(itertools.combinations(candidates, k))
+    return [tuple(row) for row in sample_combination_array(candidates, count, k=k, rng=rng).tolist()]
+
+
+def sample_combination_array(candidates, count, k=PICK_COUNT, rng=random):
+    """
+    sample_combinations의 배열 버전 (같은 rng 상태면 같은 조합을 같은 순서로 반환)
+
+    Returns:
+        (N, k) int64 배열
+    """
+    total = comb(len(candidates), k)
+    if total <= count:
+        return np.array(list(itertools.combinations(candidates, k)), dtype=np.int64).reshape(-1, k)
+
+    # 순위 → 후보 안의 위치 (1부터) → 번호
+    positions = unrank_array(_sample_ranks(total, count, rng), k) - 1
+    return np.asarray(candidates, dtype=np.int64)[positions]
+
+
+def rank_array(arr):
+    """
+    (N, 6) 조합 배열의 순위를 한 번에 계산합니다. (rank_combination의 배열 버전)
+
+    Args:
+        arr: (N, 6) 정수 배열
+
+    Returns:
+        (N,) int64 순위 배열
+    """
+    sorted_arr = np.sort(np.asarray(arr, dtype=np.int64), axis=1)
+    positions = np.arange(1, sorted_arr.shape[1] + 1)
+    return RANK_TABLE[sorted_arr, positions].sum(axis=1)
+
+
+def unrank_array(ranks, k=PICK_COUNT):
+    """
+    순위 배열로부터 조합을 한 번에 복원합니다. (unrank_combination의 배열 버전)
+
+    Args:
+        ranks: (N,) 정수 순위 배열
+        k: 조합 크기
+
+    Returns:
+        (N, k) int64 배열 (오름차순, 1부터 시작)
+    """
+    ranks = np.array(ranks, dtype=np.int64)
+    out = np.empty((len(ranks), k), dtype=np.int64)
+
+    for i in range(k, 0, -1):
+        # C(c, i) <= rank 를 만족하는 가장 큰 c (열이 c에 대해 단조 증가)
+        column = RANK_TABLE[1:, i]
+        c = np.searchsorted(column, ranks, side='right') - 1
+        ranks -= column[c]
+        out[:, i - 1] = c + 1
+
+    return out
+
+
+def all_combinations_array(order='lex'):
+    """
+    45C6 전체 조합을 (8145060, 6) uint8 배열로 생성합니다.
+
+    Args:
+        order: 'lex' (사전 순서) 또는 'colex' (행 번호 = rank_combination 순위)
+
+    Returns:
+        (8145060, 6) uint8 배열 (각 행은 오름차순)
+    """
+    flat = np.fromiter(
+        itertools.chain.from_iterable(itertools.combinations(range(1, MAX_NUMBER + 1), PICK_COUNT)),
+        dtype=np.uint8,
+        count=TOTAL_COMBINATIONS * PICK_COUNT
+    )
+    arr = flat.reshape(TOTAL_COMBINATIONS, PICK_COUNT)
+    if order == 'colex':
+        # 번호를 46 - n 으로 뒤집은 조합의 사전 순서를 거꾸로 읽으면 colex 순서
+        arr = (MAX_NUMBER + 1 - arr[::-1, ::-1]).astype(np.uint8)
+    elif order != 'lex':
+        raise ValueError(f"Unknown combination order: {order}")
+    return arr
+
+
+class FilterBitmap:
+    """전체 조합에 대한 정적 필터 통과 여부 비트 배열"""
+
+    def __init__(self, bits, spec_hash):
+        """
+        Args:
+            bits: 순위 r의 통과 여부를 r번째 비트에 담은 바이트열
+            spec_hash: 비트맵을 만든 규칙 명세의 해시
+        """
+        self.bits = bits
+        self.spec_hash = spec_hash
+
+    def passes(self, numbers):
+        """
+        조합이 정적 필터를 통과하는지 비트 조회로 확인합니다.
+
+        Args:
+            numbers: 번호 리스트
+
+        Returns:
+            True: 통과, False: 탈락
+        """
+        rank = rank_combination(numbers)
+        return bool(self.bits[rank >> 3] >> (rank & 7) & 1)
+
+    def count(self):
+        """통과하는 조합의 총 개수를 반환합니다."""
+        return sum(bin(byte).count('1') for byte in self.bits)
+
+    @classmethod
+    def build(cls, spec=None):
+        """
+        전체 조합을 colex 순서 배열로 만들어 한 번에 필터링하고 비트맵으로 압축합니다.
+        (스칼라 함수와 결과가 같은지는 vectorized_filters.py 검증으로 확인)
+
+        Args:
+            spec: 규칙 명세 dict (None이면 기본 명세)
+
+        Returns:
+            FilterBitmap 객체
+        """
+        compiled = compile_rule_spec(spec)
+        passed = compiled.vectorized(all_combinations_array(order='colex'))
+        return cls(np.packbits(passed, bitorder='little').tobytes(), compiled.spec_hash)
+
+    def save(self, path=DEFAULT_BITMAP_FILE):
+        """비트맵을 파일로 저장합니다."""
+        path = Path(path)
+        with open(path, 'wb') as f:
+            f.write(BITMAP_HEADER.pack(
+                BITMAP_MAGIC, BITMAP_VERSION, TOTAL_COMBINATIONS, bytes.fromhex(self.spec_hash)
+            ))
+            f.write(self.bits)
+
+    @classmethod
+    def load(cls, path=DEFAULT_BITMAP_FILE):
+        """
+        저장된 비트맵을 불러옵니다.
+
+        Returns:
+            FilterBitmap 객체 또는 None (파일이 없거나 형식이 맞지 않을 때)
+        """
+        path = Path(path)
+        if not path.exists():
+            return None
+
+        with open(path, 'rb') as f:
+            header = f.read(BITMAP_HEADER.size)
+            bits = f.read()
+
+        if len(header) != BITMAP_HEADER.size:
+            return None
+
+        magic, version, total, spec_digest = BITMAP_HEADER.unpack(header)
+        if magic != BITMAP_MAGIC or version != BITMAP_VERSION or total != TOTAL_COMBINATIONS:
+            return None
+
+        if len(bits) != (TOTAL_COMBINATIONS + 7) // 8:
+            return None
+
+        return cls(bits, spec_digest.hex())
+
+
+def main():
+    """필터 비트맵 생성 (1회성 빌드 단계, 인자로 규칙 명세 JSON 경로를 줄 수 있음)"""
+    import json
+    import sys
+    import time
+
+    spec = None
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], 'r', encoding='utf-8') as f:
+            spec = json.load(f)
+
+    print(f"Building filter bitmap for {TOTAL_COMBINATIONS:,} combinations...")
+    start = time.time()
+    bitmap = FilterBitmap.build(spec)
+    elapsed = time.time() - start
+
+    bitmap.save()
+    print(f"✓ Passing combinations: {bitmap.count():,}")
+    print(f"✓ Saved to {DEFAULT_BITMAP_FILE} ({elapsed:.1f}s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,230 @@
+"""
+미리 생성한 조합 풀 모듈
+(데이터셋 버전, 규칙 명세 해시)별로 필터를 통과하고 설명까지 붙인 조합을 목표 개수만큼 쌓아 두고,
+백그라운드 스레드가 줄어든 풀을 다시 채웁니다. 생성 요청은 풀에서 꺼내기만 하며,
+풀이 모자라면 None을 반환해 호출한 쪽이 직접 생성하도록 합니다.
+"""
+
+import threading
+import time
+from collections import deque
+
+from bitmask import to_mask
+
+# 같은 규칙 명세에 대해 보관할 데이터셋 버전 수 (새 버전이 들어오면 오래된 풀을 버림)
+MAX_VERSIONS_PER_SPEC = 2
+
+
+class _PoolEntry:
+    """한 (데이터셋 버전, 규칙 명세 해시)의 조합 풀"""
+
+    def __init__(self, engine_factory):
+        self.engine_factory = engine_factory
+        self.items = deque()
+        self.masks = set()
+        self.generated = 0
+        self.after_filtering = 0
+        self.core_numbers = []
+        self.last_week_numbers = []
+        self.exclude_numbers = []
+        self.exact_filter_rate = None
+        self.stalled = False  # 마지막 채우기에서 새 조합이 없었음 (다음에 꺼낼 때까지 채우지 않음)
+
+
+class CombinationPool:
+    """백그라운드 스레드가 목표 개수를 유지하는 조합 풀 (스레드 안전)"""
+
+    def __init__(self, target_size=500, refill_batch=100, strategy='sample'):
+        """
+        Args:
+            target_size: 키마다 유지할 조합 수 (0이면 사용하지 않음)
+            refill_batch: 한 번에 생성해 채울 조합 수
+            strategy: 채울 때 사용할 생성 방식
+        """
+        self.target_size = target_size
+        self.refill_batch = refill_batch
+        self.strategy = strategy
+        self._entries = {}
+        self._cond = threading.Condition()
+        self._thread = None
+        self.hits = 0
+        self.misses = 0
+        self.refills = 0
+        self.refill_seconds = 0.0
+        self.last_refill_ms = None
+
+    @property
+    def enabled(self):
+        return self.target_size > 0
+
+    def start(self):
+        """채우기 스레드를 시작합니다. (이미 실행 중이면 무시)"""
+        with self._cond:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='combination-pool', daemon=True)
+                self._thread.start()
+        return self
+
+    def warm(self, key, engine_factory):
+        """
+        요청이 오기 전에 풀을 등록하고 채우기 시작합니다.
+
+        Args:
+            key: (데이터셋 버전, 규칙 명세 해시)
+            engine_factory: 채울 때 사용할 LottoRuleEngine을 만드는 함수
+        """
+        self.start()
+        with self._cond:
+            if key not in self._entries:
+                self._register(key, engine_factory)
+            self._cond.notify()
+
+    def pop(self, key, count, engine_factory, exclude=None):
+        """
+        풀에서 조합 count개를 꺼냅니다. 처음 보는 키면 풀을 등록하고 채우기 시작합니다.
+
+        Args:
+            key: (데이터셋 버전, 규칙 명세 해시)
+            count: 꺼낼 조합 수
+            engine_factory: 채울 때 사용할 LottoRuleEngine을 만드는 함수
+            exclude: 건너뛸 조합 비트마스크 (`in`을 지원하는 집합 또는 Bloom 필터).
+                     건너뛴 조합은 다른 요청을 위해 풀에 남겨 둠
+
+        Returns:
+            dict: {
+                'combinations': [{'numbers', 'explanation'}, ...],
+                'core_numbers', 'last_week_numbers', 'exclude_numbers', 'statistics'
+            }
+            또는 None (풀에 건너뛰지 않을 조합이 count개 없을 때)
+        """
+        self.start()
+        with self._cond:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._register(key, engine_factory)
+
+            entry.stalled = False
+
+            # 앞에서부터 제외 대상이 아닌 조합을 count개 고름 (제외 대상은 풀에 그대로 둠)
+            picked = []
+            for position, item in enumerate(entry.items):
+                if len(picked) >= count:
+                    break
+                if exclude is None or to_mask(item['numbers']) not in exclude:
+                    picked.append(position)
+
+            if len(picked) < count:
+                self.misses += 1
+                self._cond.notify()
+                return None
+
+            picked_set = set(picked)
+            items = [entry.items[position] for position in picked]
+            entry.items = deque(item for position, item in enumerate(entry.items) if position not in picked_set)
+            for item in items:
+                entry.masks.discard(to_mask(item['numbers']))
+            self.hits += 1
+            self._cond.notify()
+
+            return {
+                'combinations': items,
+                'core_numbers': entry.core_numbers,
+                'last_week_numbers': entry.last_week_numbers,
+                'exclude_numbers': entry.exclude_numbers,
+                'statistics': {
+                    'total_generated': entry.generated,
+                    'after_filtering': entry.after_filtering,
+                    'returned': len(items),
+                    'filter_rate': f"{entry.after_filtering / max(1, entry.generated) * 100:.1f}%",
+                    'exact_filter_rate': entry.exact_filter_rate,
+                    'selection': 'first',
+                    'source': 'pool'
+                }
+            }
+
+    def _register(self, key, engine_factory):
+        """새 키의 풀을 만들고, 같은 규칙 명세의 오래된 데이터셋 버전 풀을 버립니다. (잠금 안에서 호출)"""
+        entry = _PoolEntry(engine_factory)
+        self._entries[key] = entry
+
+        same_spec = [k for k in self._entries if k[1] == key[1]]
+        for old_key in same_spec[:-MAX_VERSIONS_PER_SPEC]:
+            del self._entries[old_key]
+        return entry
+
+    def _next_refill(self):
+        """가장 많이 모자란 풀의 키를 반환합니다. (잠금 안에서 호출)"""
+        short = [(len(entry.items), key) for key, entry in self._entries.items()
+                 if len(entry.items) < self.target_size and not entry.stalled]
+        return min(short, key=lambda item: item[0])[1] if short else None
+
+    def _run(self):
+        while True:
+            with self._cond:
+                key = self._next_refill()
+                while key is None:
+                    self._cond.wait()
+                    key = self._next_refill()
+                entry = self._entries[key]
+
+            try:
+                self._refill(entry)
+            except Exception as e:
+                print(f"Combination pool refill failed: {e}")
+                time.sleep(1)
+
+    def _refill(self, entry):
+        """풀 하나에 조합을 한 묶음 생성해 추가합니다. (잠금 밖에서 생성)"""
+        start = time.time()
+        engine = entry.engine_factory()
+        result = engine.generate_combinations(num_combinations=self.refill_batch, strategy=self.strategy)
+        items = [
+            {'numbers': combo, 'explanation': engine.explain_combination(combo)}
+            for combo in result['combinations']
+        ]
+        elapsed = time.time() - start
+
+        with self._cond:
+            entry.core_numbers = result['core_numbers']
+            entry.last_week_numbers = result['last_week_numbers']
+            entry.exclude_numbers = result['exclude_numbers']
+            entry.exact_filter_rate = result['statistics'].get('exact_filter_rate')
+            entry.generated += result['statistics']['total_generated']
+            entry.after_filtering += result['statistics']['after_filtering']
+
+            added = 0
+            for item in items:
+                mask = to_mask(item['numbers'])
+                if mask not in entry.masks and len(entry.items) < self.target_size:
+                    entry.masks.add(mask)
+                    entry.items.append(item)
+                    added += 1
+            # 필터를 통과하는 조합이 다 풀에 있으면 같은 조합만 반복 생성하지 않도록 멈춤
+            entry.stalled = added == 0
+
+            self.refills += 1
+            self.refill_seconds += elapsed
+            self.last_refill_ms = round(elapsed * 1000, 1)
+
+    def clear(self):
+        """모든 풀을 비웁니다."""
+        with self._cond:
+            self._entries.clear()
+
+    def info(self):
+        """풀 깊이와 채우기 통계를 반환합니다."""
+        with self._cond:
+            return {
+                'enabled': self.enabled,
+                'target_size': self.target_size,
+                'refill_batch': self.refill_batch,
+                'pools': [
+                    {'version': key[0], 'spec_hash': key[1], 'depth': len(entry.items)}
+                    for key, entry in self._entries.items()
+                ],
+                'hits': self.hits,
+                'misses': self.misses,
+                'refills': self.refills,
+                'avg_refill_ms': round(self.refill_seconds / self.refills * 1000, 1) if self.refills else None,
+                'last_refill_ms': self.last_refill_ms
+            }
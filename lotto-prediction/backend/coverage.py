@@ -0,0 +1,127 @@
+"""
+커버리지 최적화 조합 선택 모듈
+필터를 통과한 후보 조합 중에서 서로 다른 번호 쌍(2개)과 삼중(3개)을 최대한 많이
+덮도록 N개를 탐욕적으로 고릅니다. (커버링 디자인 근사)
+쌍/삼중 → 후보 역색인으로 조합을 하나 고를 때마다 영향을 받는 후보의 이득만 갱신합니다.
+"""
+
+from itertools import combinations as index_combinations
+
+import numpy as np
+
+from bitmask import to_mask_array, popcount_array
+
+# 번호 쌍/삼중 → 일련번호 (a < b < c)
+_PAIRS = np.array(list(index_combinations(range(1, 46), 2)))
+_TRIPLES = np.array(list(index_combinations(range(1, 46), 3)))
+NUM_PAIRS = len(_PAIRS)
+NUM_TRIPLES = len(_TRIPLES)
+
+PAIR_ID = np.full((46, 46), -1, dtype=np.int32)
+PAIR_ID[_PAIRS[:, 0], _PAIRS[:, 1]] = np.arange(NUM_PAIRS)
+TRIPLE_ID = np.full((46, 46, 46), -1, dtype=np.int32)
+TRIPLE_ID[_TRIPLES[:, 0], _TRIPLES[:, 1], _TRIPLES[:, 2]] = np.arange(NUM_TRIPLES)
+
+# 조합 안의 위치 쌍/삼중 (6개 중 2개 15가지, 3개 20가지)
+_PAIR_POSITIONS = np.array(list(index_combinations(range(6), 2)))
+_TRIPLE_POSITIONS = np.array(list(index_combinations(range(6), 3)))
+
+
+def combination_pair_ids(arr):
+    """(K, 6) 조합 배열의 번호 쌍 일련번호 (K, 15)"""
+    arr = np.sort(arr, axis=1)
+    return PAIR_ID[arr[:, _PAIR_POSITIONS[:, 0]], arr[:, _PAIR_POSITIONS[:, 1]]]
+
+
+def combination_triple_ids(arr):
+    """(K, 6) 조합 배열의 번호 삼중 일련번호 (K, 20)"""
+    arr = np.sort(arr, axis=1)
+    return TRIPLE_ID[arr[:, _TRIPLE_POSITIONS[:, 0]], arr[:, _TRIPLE_POSITIONS[:, 1]], arr[:, _TRIPLE_POSITIONS[:, 2]]]
+
+
+def _inverted_index(ids, size):
+    """
+    항목 → 후보 역색인을 CSR 형식으로 만듭니다.
+
+    Returns:
+        (offsets (size + 1,), 후보 인덱스 배열) 튜플
+    """
+    flat = ids.ravel()
+    # 일련번호가 16비트에 들어가므로 안정 정렬이 기수 정렬로 처리됨
+    order = np.argsort(flat.astype(np.int16), kind='stable')
+    offsets = np.zeros(size + 1, dtype=np.int64)
+    np.cumsum(np.bincount(flat, minlength=size), out=offsets[1:])
+    return offsets, (order // ids.shape[1]).astype(np.int64)
+
+
+def _newly_covered(item_ids, covered, offsets, owners, num_candidates):
+    """새로 덮인 항목을 표시하고, 각 후보가 잃는 이득(새로 덮인 항목 수)을 반환합니다."""
+    new_items = item_ids[~covered[item_ids]]
+    covered[new_items] = True
+    if not len(new_items):
+        return None
+    affected = np.concatenate([owners[offsets[i]:offsets[i + 1]] for i in new_items])
+    return np.bincount(affected, minlength=num_candidates)
+
+
+def select_covering(combinations, count, pair_weight=1.0, triple_weight=1.0, max_overlap=None):
+    """
+    덮는 번호 쌍/삼중이 최대가 되도록 후보 조합 중 count개를 탐욕적으로 고릅니다.
+
+    Args:
+        combinations: 후보 조합 리스트 또는 (K, 6) 배열
+        count: 고를 조합 수
+        pair_weight: 새로 덮는 번호 쌍 하나의 가치
+        triple_weight: 새로 덮는 번호 삼중 하나의 가치
+        max_overlap: 이미 고른 조합과 겹쳐도 되는 최대 번호 수 (없으면 제한 없음)
+
+    Returns:
+        dict: {
+            'indices': 고른 후보 인덱스 리스트 (고른 순서),
+            'pair_coverage': 덮은 번호 쌍 수,
+            'triple_coverage': 덮은 번호 삼중 수
+        }
+    """
+    arr = np.asarray(combinations, dtype=np.int64).reshape(-1, 6)
+    num_candidates = len(arr)
+
+    pair_ids = combination_pair_ids(arr)
+    triple_ids = combination_triple_ids(arr)
+    pair_offsets, pair_owners = _inverted_index(pair_ids, NUM_PAIRS)
+    triple_offsets, triple_owners = _inverted_index(triple_ids, NUM_TRIPLES)
+
+    # 후보별로 아직 덮이지 않은 쌍/삼중 수
+    open_pairs = np.full(num_candidates, pair_ids.shape[1], dtype=np.int64)
+    open_triples = np.full(num_candidates, triple_ids.shape[1], dtype=np.int64)
+    covered_pairs = np.zeros(NUM_PAIRS, dtype=bool)
+    covered_triples = np.zeros(NUM_TRIPLES, dtype=bool)
+    available = np.ones(num_candidates, dtype=bool)
+
+    masks = to_mask_array(arr) if max_overlap is not None else None
+    selected = []
+
+    while len(selected) < min(count, num_candidates):
+        gain = np.where(available, pair_weight * open_pairs + triple_weight * open_triples, -1.0)
+        best = int(np.argmax(gain))
+        if gain[best] < 0:
+            break
+
+        selected.append(best)
+        available[best] = False
+
+        lost = _newly_covered(pair_ids[best], covered_pairs, pair_offsets, pair_owners, num_candidates)
+        if lost is not None:
+            open_pairs -= lost
+        lost = _newly_covered(triple_ids[best], covered_triples, triple_offsets, triple_owners, num_candidates)
+        if lost is not None:
+            open_triples -= lost
+
+        # 고른 조합과 너무 많이 겹치는 후보 제외 (비트마스크 AND 후 popcount)
+        if masks is not None:
+            available &= popcount_array(masks & masks[best]) <= max_overlap
+
+    return {
+        'indices': selected,
+        'pair_coverage': int(covered_pairs.sum()),
+        'triple_coverage': int(covered_triples.sum())
+    }
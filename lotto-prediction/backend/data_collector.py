@@ -8,6 +8,8 @@ import json
 from datetime import datetime, timedelta
 from pathlib import Path
 
+from history_store import DrawHistory, save_binary
+
 
 class LottoDataCollector:
     """로또 당첨 번호 수집 및 저장 클래스"""
@@ -16,6 +18,7 @@ class LottoDataCollector:
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(exist_ok=True)
         self.data_file = self.data_dir / 'lotto_history.json'
+        self.binary_file = self.data_dir / 'lotto_history.bin'
         self.base_url = 'https://www.dhlottery.co.kr/common.do?method=getLottoNumber&drwNo='
         
     def get_latest_draw_number(self):
@@ -113,10 +116,12 @@ class LottoDataCollector:
         return all_data
     
     def save_data(self, data):
-        """데이터를 JSON 파일로 저장합니다."""
+        """데이터를 JSON 파일과 바이너리 파일(메모리 맵 로딩용)로 저장합니다."""
         with open(self.data_file, 'w', encoding='utf-8') as f:
             json.dump(data, f, ensure_ascii=False, indent=2)
-        print(f"\n✓ Data saved to {self.data_file}")
+        # JSON보다 늦게 써야 LottoDataset이 바이너리를 최신으로 인식함
+        save_binary(DrawHistory.from_records(data), self.binary_file)
+        print(f"\n✓ Data saved to {self.data_file} (+ {self.binary_file.name})")
     
     def load_data(self):
         """저장된 데이터를 불러옵니다."""
@@ -126,8 +131,14 @@ class LottoDataCollector:
         with open(self.data_file, 'r', encoding='utf-8') as f:
             return json.load(f)
     
-    def update_data(self):
-        """데이터를 업데이트합니다 (새로운 회차가 있는 경우)."""
+    def update_data(self, on_new_draw=None):
+        """
+        데이터를 업데이트합니다 (새로운 회차가 있는 경우).
+        
+        Args:
+            on_new_draw: 새 회차를 추가할 때마다 레코드를 인자로 호출할 함수
+                         (예: HistoryStats.append로 통계를 증분 갱신)
+        """
         existing_data = self.load_data()
         
         if not existing_data:
@@ -151,6 +162,8 @@ class LottoDataCollector:
             if draw_data:
                 existing_data.append(draw_data)
                 print(f"✓ Draw {draw_num}: {draw_data['winning_numbers']} + {draw_data['bonus_number']}")
+                if on_new_draw:
+                    on_new_draw(draw_data)
         
         self.save_data(existing_data)
         return existing_data
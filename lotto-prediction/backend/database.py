@@ -50,6 +50,19 @@ def init_db():
     )
     ''')
     
+    # 사용자별 회차 발급/저장 조합 Bloom 필터 테이블 생성 (압축한 비트 배열)
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS issued_filters (
+        user_id INTEGER NOT NULL,
+        draw_number INTEGER NOT NULL,
+        bits BLOB NOT NULL,
+        item_count INTEGER NOT NULL DEFAULT 0,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (user_id, draw_number),
+        FOREIGN KEY (user_id) REFERENCES users (id)
+    )
+    ''')
+    
     conn.commit()
     conn.close()
     print(f"✅ Database initialized at {DB_PATH}")
@@ -0,0 +1,120 @@
+"""
+인메모리 데이터셋 모듈
+lotto_history.json을 한 번 읽어 메모리에 두고, 파일의 수정 시각/크기가
+바뀌었을 때만 다시 읽어 원자적으로 교체합니다. (요청 경로에서 네트워크 I/O 없음)
+JSON과 함께 저장된 lotto_history.bin이 최신이면 그 파일을 메모리 맵으로 엽니다.
+"""
+
+import json
+import threading
+from collections import namedtuple
+from pathlib import Path
+
+from history_store import DrawHistory, as_history, open_binary
+
+# 불변 데이터셋 스냅샷: 컬럼형 기록, 버전, 파일 상태 ((수정 시각 ns, 크기) JSON/바이너리 쌍)
+DatasetSnapshot = namedtuple('DatasetSnapshot', ['history', 'version', 'stamp'])
+
+EMPTY_SNAPSHOT = DatasetSnapshot(history=DrawHistory.from_records([]), version='0-empty', stamp=None)
+
+
+def dataset_version(lotto_data):
+    """
+    데이터셋 버전 문자열을 계산합니다.
+
+    Args:
+        lotto_data: 로또 데이터 (DrawHistory 또는 레코드 리스트)
+
+    Returns:
+        '<최신 회차>-<내용 해시 앞 16자리>' 형식의 문자열
+    """
+    history = as_history(lotto_data)
+    if not len(history):
+        return EMPTY_SNAPSHOT.version
+
+    latest = int(history.draw_numbers[-1])
+    return f'{latest}-{history.content_hash()[:16]}'
+
+
+class LottoDataset:
+    """파일 변경 시에만 다시 읽는 스레드 안전 인메모리 데이터셋"""
+
+    def __init__(self, data_file, binary_file=None):
+        """
+        Args:
+            data_file: lotto_history.json 경로
+            binary_file: lotto_history.bin 경로 (없으면 JSON과 같은 위치)
+        """
+        self.data_file = Path(data_file)
+        self.binary_file = Path(binary_file) if binary_file else self.data_file.with_suffix('.bin')
+        self._lock = threading.Lock()
+        self._snapshot = EMPTY_SNAPSHOT
+
+    def _stat(self):
+        """JSON/바이너리 파일 상태 쌍을 반환합니다. 둘 다 없으면 None"""
+        stamp = (_file_stat(self.data_file), _file_stat(self.binary_file))
+        return stamp if stamp != (None, None) else None
+
+    def _load(self, stamp):
+        """
+        파일에서 DrawHistory를 읽습니다.
+        바이너리가 JSON보다 오래되지 않았으면 메모리 맵으로 열고, 아니면 JSON을 파싱합니다.
+        """
+        json_stat, binary_stat = stamp
+        if binary_stat and (json_stat is None or binary_stat[0] >= json_stat[0]):
+            history = open_binary(self.binary_file)
+            if history is not None:
+                return history
+
+        with open(self.data_file, 'r', encoding='utf-8') as f:
+            return DrawHistory.from_records(json.load(f))
+
+    def get(self):
+        """
+        현재 데이터셋 스냅샷을 반환합니다.
+        파일 상태가 마지막으로 읽은 때와 다르면 먼저 다시 읽습니다.
+
+        Returns:
+            DatasetSnapshot
+        """
+        snapshot = self._snapshot
+        if self._stat() == snapshot.stamp:
+            return snapshot
+        return self.reload()
+
+    def reload(self):
+        """
+        파일을 다시 읽어 스냅샷을 교체합니다.
+        파일이 없으면 빈 데이터셋, 읽기에 실패하면 이전 스냅샷을 유지합니다.
+
+        Returns:
+            DatasetSnapshot
+        """
+        with self._lock:
+            stamp = self._stat()
+
+            # 다른 스레드가 이미 다시 읽은 경우
+            if stamp == self._snapshot.stamp:
+                return self._snapshot
+
+            if stamp is None:
+                self._snapshot = EMPTY_SNAPSHOT
+                return self._snapshot
+
+            try:
+                history = self._load(stamp)
+            except Exception as e:
+                print(f"Data load failed: {e}")
+                return self._snapshot
+
+            self._snapshot = DatasetSnapshot(history=history, version=dataset_version(history), stamp=stamp)
+            return self._snapshot
+
+
+def _file_stat(path):
+    """파일 상태 (수정 시각 ns, 크기)를 반환합니다. 파일이 없으면 None"""
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
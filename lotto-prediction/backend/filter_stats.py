@@ -0,0 +1,154 @@
+"""
+필터 규칙별 통계 모듈
+규칙마다 평가 횟수, 탈락 횟수, 누적 시간을 기록하고
+관측된 비율로 규칙 평가 순서를 정합니다.
+"""
+
+import threading
+import time
+
+
+class FilterStats:
+    """규칙별 평가/탈락 횟수와 누적 시간 (스레드 안전)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._rules = {}  # 규칙 이름 → [평가 횟수, 탈락 횟수, 누적 시간(ns)]
+
+    def record(self, name, evaluated, rejected, elapsed_ns):
+        """
+        규칙 한 번의 일괄 평가 결과를 기록합니다.
+
+        Args:
+            name: 규칙 이름
+            evaluated: 평가한 조합 수
+            rejected: 탈락한 조합 수
+            elapsed_ns: 걸린 시간 (나노초)
+        """
+        with self._lock:
+            entry = self._rules.setdefault(name, [0, 0, 0])
+            entry[0] += evaluated
+            entry[1] += rejected
+            entry[2] += elapsed_ns
+
+    def merge(self, other):
+        """다른 FilterStats의 기록을 합칩니다."""
+        for name, (evaluated, rejected, elapsed_ns) in other._items():
+            self.record(name, evaluated, rejected, elapsed_ns)
+
+    def reset(self):
+        """기록을 모두 지웁니다."""
+        with self._lock:
+            self._rules.clear()
+
+    def _items(self):
+        with self._lock:
+            return [(name, tuple(entry)) for name, entry in self._rules.items()]
+
+    def snapshot(self):
+        """
+        규칙별 통계를 반환합니다.
+
+        Returns:
+            dict: {규칙 이름: {'evaluated', 'rejected', 'rejection_rate', 'avg_time_ns', 'total_time_ms'}}
+        """
+        result = {}
+        for name, (evaluated, rejected, elapsed_ns) in self._items():
+            result[name] = {
+                'evaluated': evaluated,
+                'rejected': rejected,
+                'rejection_rate': round(rejected / evaluated, 4) if evaluated else 0.0,
+                'avg_time_ns': round(elapsed_ns / evaluated, 1) if evaluated else 0.0,
+                'total_time_ms': round(elapsed_ns / 1e6, 3)
+            }
+        return result
+
+    def order_rules(self, rules):
+        """
+        비용 대비 탈락률이 높은 규칙이 먼저 오도록 정렬합니다.
+        (평균 시간 / 탈락률 오름차순, 기록이 없는 규칙은 원래 순서 유지)
+
+        Args:
+            rules: (이름, 판정 함수) 리스트
+
+        Returns:
+            정렬된 (이름, 판정 함수) 리스트
+        """
+        stats = self.snapshot()
+
+        def score(indexed_rule):
+            index, (name, _) = indexed_rule
+            entry = stats.get(name)
+            if not entry or not entry['evaluated']:
+                return (0, 0.0, index)
+            if not entry['rejected']:
+                return (2, 0.0, index)  # 탈락시키지 않는 규칙은 맨 뒤로
+            return (1, entry['avg_time_ns'] / entry['rejection_rate'], index)
+
+        return [rule for _, rule in sorted(enumerate(rules), key=score)]
+
+
+def apply_rule_chain(items, rules, key=None, stats=None):
+    """
+    규칙을 순서대로 일괄 적용합니다. 각 규칙은 이전 규칙을 통과한 항목만 평가하므로
+    조합별로 규칙을 단락 평가하는 것과 결과가 같습니다.
+
+    Args:
+        items: 평가할 항목 리스트
+        rules: (이름, 판정 함수) 리스트
+        key: 판정 함수에 넘길 값으로 항목을 변환하는 함수 (없으면 항목 그대로)
+        stats: 결과를 기록할 FilterStats (없으면 기록하지 않음)
+
+    Returns:
+        모든 규칙을 통과한 항목 리스트
+    """
+    if key is None:
+        pairs = [(item, item) for item in items]
+    else:
+        pairs = [(item, key(item)) for item in items]
+
+    for name, predicate in rules:
+        if not pairs:
+            break
+
+        start = time.perf_counter_ns()
+        survivors = [pair for pair in pairs if predicate(pair[1])]
+        elapsed_ns = time.perf_counter_ns() - start
+
+        if stats is not None:
+            stats.record(name, len(pairs), len(pairs) - len(survivors), elapsed_ns)
+        pairs = survivors
+
+    return [item for item, _ in pairs]
+
+
+def apply_array_rule_chain(arr, rules, stats=None):
+    """
+    배열 판정 규칙을 순서대로 일괄 적용합니다. (apply_rule_chain의 배열 버전)
+    각 규칙은 이전 규칙을 통과한 행만 평가하므로 묶음 단위 규칙별 통계가 스칼라 방식과 같습니다.
+
+    Args:
+        arr: (N, 6) 조합 배열
+        rules: (이름, 배열 판정 함수) 리스트 (판정 함수는 (N,) bool 배열을 반환)
+        stats: 결과를 기록할 FilterStats (없으면 기록하지 않음)
+
+    Returns:
+        모든 규칙을 통과한 행의 배열
+    """
+    for name, predicate in rules:
+        if not len(arr):
+            break
+
+        start = time.perf_counter_ns()
+        survivors = arr[predicate(arr)]
+        elapsed_ns = time.perf_counter_ns() - start
+
+        if stats is not None:
+            stats.record(name, len(arr), len(arr) - len(survivors), elapsed_ns)
+        arr = survivors
+
+    return arr
+
+
+# 프로세스 전체 누적 통계 (디버그 엔드포인트 및 적응형 순서 결정용)
+GLOBAL_FILTER_STATS = FilterStats()
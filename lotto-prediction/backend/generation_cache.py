@@ -0,0 +1,82 @@
+"""
+생성 결과 캐시 모듈
+시드를 지정한 생성 요청은 결과가 (데이터셋 버전, 규칙 프로필, 생성/선택 방식, 시드, 개수)로
+정해지므로, 설명까지 붙인 응답 데이터를 LRU로 보관해 같은 요청(재시도 포함)을 다시 계산하지 않습니다.
+"""
+
+import threading
+from collections import OrderedDict
+
+
+class GenerationCache:
+    """생성 요청 키 → 응답 데이터 LRU 캐시 (스레드 안전)"""
+
+    def __init__(self, max_entries=256):
+        """
+        Args:
+            max_entries: 보관할 최대 항목 수 (0이면 캐시하지 않음)
+        """
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(version, spec_hash, strategy, selection, seed, count):
+        """
+        캐시 키를 만듭니다.
+
+        Args:
+            version: 데이터셋 버전
+            spec_hash: 규칙 명세 해시 (프로필마다 다름)
+            strategy: 생성 방식
+            selection: 최종 선택 방식
+            seed: 난수 시드
+            count: 생성할 조합 수
+
+        Returns:
+            튜플 키
+        """
+        return (version, spec_hash, strategy, selection, seed, count)
+
+    def get(self, key):
+        """
+        저장된 응답 데이터를 반환합니다. (반환값은 여러 요청이 공유하므로 수정하지 않음)
+
+        Returns:
+            응답 데이터 dict 또는 None
+        """
+        with self._lock:
+            data = self._entries.get(key)
+            if data is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return data
+
+    def put(self, key, data):
+        """응답 데이터를 저장하고 가장 오래 쓰이지 않은 항목부터 버립니다."""
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = data
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """캐시를 비웁니다."""
+        with self._lock:
+            self._entries.clear()
+
+    def info(self):
+        """캐시 상태를 반환합니다."""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses
+            }
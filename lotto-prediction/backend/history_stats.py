@@ -0,0 +1,126 @@
+"""
+증분 통계 모듈
+번호별 전체 출현 횟수와 최근 N회차 출현 횟수를 불변 스냅샷으로 보관하고,
+새 회차가 추가되면 전체를 다시 세지 않고 O(45)로 갱신한 새 스냅샷을 만듭니다.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+from history_store import as_history
+
+
+_HistoryStatsFields = namedtuple('HistoryStats', [
+    'draw_count',         # 반영된 회차 수
+    'latest_draw',        # 마지막으로 반영된 회차 번호 (없으면 0)
+    'recent_window',      # 최근 회차 구간 크기
+    'total_counts',       # 번호별 전체 출현 횟수 (46,) (보너스 포함, 읽기 전용)
+    'recent_counts',      # 번호별 최근 구간 출현 횟수 (46,) (보너스 제외, 읽기 전용)
+    'window_rows',        # 최근 구간 당첨 번호 튜플 (오래된 회차부터)
+    'last_week_numbers'   # 가장 최근 회차 당첨 번호 튜플
+])
+
+
+class HistoryStats(_HistoryStatsFields):
+    """회차가 추가될 때마다 새로 만들어지는 불변 통계 스냅샷"""
+
+    __slots__ = ()
+
+    def __new__(cls, draw_count, latest_draw, recent_window, total_counts,
+                recent_counts, window_rows, last_week_numbers):
+        total_counts.setflags(write=False)
+        recent_counts.setflags(write=False)
+        return super().__new__(cls, draw_count, latest_draw, recent_window, total_counts,
+                               recent_counts, window_rows, last_week_numbers)
+
+    @classmethod
+    def from_history(cls, lotto_data, recent_window=10):
+        """
+        전체 기록으로부터 통계를 계산합니다.
+
+        Args:
+            lotto_data: 로또 데이터 (DrawHistory 또는 레코드 리스트)
+            recent_window: 최근 회차 구간 크기
+
+        Returns:
+            HistoryStats 객체
+        """
+        history = as_history(lotto_data)
+        window_rows = history.winning_numbers[len(history) - min(recent_window, len(history)):].tolist()
+
+        return cls(
+            draw_count=len(history),
+            latest_draw=int(history.draw_numbers[-1]) if len(history) else 0,
+            recent_window=recent_window,
+            total_counts=history.frequency(include_bonus=True).astype(np.int32),
+            recent_counts=history.recent_frequency(recent_window, include_bonus=False).astype(np.int32),
+            window_rows=tuple(tuple(row) for row in window_rows),
+            last_week_numbers=tuple(history.winning_numbers[-1].tolist()) if len(history) else ()
+        )
+
+    def append(self, record):
+        """
+        새 회차 하나를 반영한 새 스냅샷을 반환합니다. (기존 스냅샷은 바뀌지 않음)
+
+        Args:
+            record: {'draw_number', 'winning_numbers', 'bonus_number', ...}
+
+        Returns:
+            HistoryStats 객체
+
+        Raises:
+            ValueError: 이미 반영된 회차보다 이전 회차일 때
+        """
+        if record['draw_number'] <= self.latest_draw:
+            raise ValueError(f"Draw {record['draw_number']} is not newer than {self.latest_draw}")
+
+        winning = tuple(record['winning_numbers'])
+
+        total_counts = self.total_counts.copy()
+        total_counts[list(winning) + [record['bonus_number']]] += 1
+
+        recent_counts = self.recent_counts.copy()
+        window_rows = self.window_rows
+        if self.recent_window:
+            # 새 회차를 더하고 구간을 벗어난 가장 오래된 회차를 뺌
+            recent_counts[list(winning)] += 1
+            window_rows = window_rows + (winning,)
+            if len(window_rows) > self.recent_window:
+                recent_counts[list(window_rows[0])] -= 1
+                window_rows = window_rows[1:]
+
+        return HistoryStats(
+            draw_count=self.draw_count + 1,
+            latest_draw=record['draw_number'],
+            recent_window=self.recent_window,
+            total_counts=total_counts,
+            recent_counts=recent_counts,
+            window_rows=window_rows,
+            last_week_numbers=winning
+        )
+
+    def analysis(self, candidates):
+        """
+        규칙 명세의 후보 조건으로 핵심/제외 번호를 계산합니다.
+
+        Args:
+            candidates: 규칙 명세의 'candidates' 섹션
+
+        Returns:
+            dict: {'core_numbers', 'last_week_numbers', 'exclude_numbers'}
+        """
+        core_min, core_max = candidates['core_min_count'], candidates['core_max_count']
+        threshold, exceptions = candidates['recent_threshold'], candidates['exceptions']
+
+        return {
+            'core_numbers': [
+                n for n in range(1, 46)
+                if self.total_counts[n] and core_min <= self.total_counts[n] <= core_max
+            ],
+            'last_week_numbers': list(self.last_week_numbers),
+            'exclude_numbers': [
+                n for n in range(1, 46)
+                if self.recent_counts[n] >= threshold and n not in exceptions
+            ]
+        }
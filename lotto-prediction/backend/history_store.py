@@ -0,0 +1,323 @@
+"""
+컬럼형 당첨 번호 저장소 모듈
+당첨 번호를 (D, 7) NumPy 배열(당첨 번호 6개 + 보너스)과 날짜 배열로 보관하고,
+회차 번호 → 행 인덱스를 배열로 두어 회차 조회와 최신 회차 조회를 O(1)로 처리합니다.
+번호별 누적 출현 횟수(prefix sum)로 임의 회차 구간의 빈도를 뺄셈 한 번으로 계산합니다.
+번호 → 출현 회차 비트셋 역색인으로 조합이 과거 각 회차에서 맞춘 개수를 비트 연산으로 구합니다.
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+from pathlib import Path
+
+import numpy as np
+
+# 바이너리 파일 형식: 헤더(매직, 포맷 버전, 행 크기, 행 수) + 고정 폭 행
+BINARY_MAGIC = b'LTHB'
+BINARY_VERSION = 1
+BINARY_HEADER = struct.Struct('<4sHHI')
+
+# 행: 회차(uint16) + 1회차 추첨일 기준 경과일(uint16) + 당첨 번호 6개와 보너스(uint8 x 7)
+ROW_DTYPE = np.dtype([('draw_number', '<u2'), ('day', '<u2'), ('numbers', 'u1', (7,))])
+DATE_EPOCH = np.datetime64('2002-12-07', 'D')  # 로또 1회차 추첨일
+
+
+class DrawHistory:
+    """회차 오름차순으로 정렬된 컬럼형 당첨 번호 기록"""
+
+    def __init__(self, draw_numbers, numbers, dates):
+        """
+        Args:
+            draw_numbers: 회차 번호 배열 (D,)
+            numbers: 당첨 번호 6개 + 보너스 번호 배열 (D, 7)
+            dates: 추첨일 배열 (D,) (YYYY-MM-DD 문자열 또는 datetime64)
+        """
+        draw_numbers = np.asarray(draw_numbers, dtype=np.int32)
+        numbers = np.asarray(numbers, dtype=np.uint8).reshape(-1, 7)
+        dates = np.asarray(dates, dtype='datetime64[D]')
+
+        # 이미 회차순이면 재배열하지 않음 (메모리 맵 배열을 복사 없이 사용)
+        if np.all(draw_numbers[1:] > draw_numbers[:-1]):
+            self.draw_numbers, self.numbers, self.dates = draw_numbers, numbers, dates
+        else:
+            order = np.argsort(draw_numbers, kind='stable')
+            self.draw_numbers, self.numbers, self.dates = draw_numbers[order], numbers[order], dates[order]
+
+        # 회차 → 행 인덱스 (첫 회차 기준 오프셋, 빠진 회차는 -1)
+        if len(self.draw_numbers):
+            self.first_draw = int(self.draw_numbers[0])
+            self._row_index = np.full(int(self.draw_numbers[-1]) - self.first_draw + 1, -1, dtype=np.int32)
+            self._row_index[self.draw_numbers - self.first_draw] = np.arange(len(self.draw_numbers))
+        else:
+            self.first_draw = 0
+            self._row_index = np.zeros(0, dtype=np.int32)
+
+        # 번호별 누적 출현 횟수, 출현 회차 비트셋 (처음 조회할 때 계산)
+        self._prefix_counts = None
+        self._draw_bitsets = None
+
+    @classmethod
+    def from_records(cls, records):
+        """
+        JSON 레코드 리스트로부터 생성합니다.
+
+        Args:
+            records: [{'draw_number', 'draw_date', 'winning_numbers', 'bonus_number'}, ...]
+
+        Returns:
+            DrawHistory 객체
+        """
+        return cls(
+            [r['draw_number'] for r in records],
+            [list(r['winning_numbers']) + [r['bonus_number']] for r in records],
+            [r['draw_date'] for r in records]
+        )
+
+    @property
+    def winning_numbers(self):
+        """당첨 번호 배열 (D, 6)"""
+        return self.numbers[:, :6]
+
+    @property
+    def bonus_numbers(self):
+        """보너스 번호 배열 (D,)"""
+        return self.numbers[:, 6]
+
+    def __len__(self):
+        return len(self.draw_numbers)
+
+    def __iter__(self):
+        for row in range(len(self)):
+            yield self.record(row)
+
+    def row_of(self, draw_number):
+        """
+        회차 번호의 행 인덱스를 반환합니다.
+
+        Returns:
+            행 인덱스 또는 None (없는 회차이거나 정수가 아닐 때)
+        """
+        if isinstance(draw_number, bool) or not isinstance(draw_number, (int, np.integer)):
+            return None
+        offset = int(draw_number) - self.first_draw
+        if offset < 0 or offset >= len(self._row_index):
+            return None
+        row = int(self._row_index[offset])
+        return row if row >= 0 else None
+
+    def record(self, row):
+        """행을 JSON 레코드 형식의 dict로 반환합니다."""
+        values = self.numbers[row].tolist()
+        return {
+            'draw_number': int(self.draw_numbers[row]),
+            'draw_date': str(self.dates[row]),
+            'winning_numbers': values[:6],
+            'bonus_number': values[6]
+        }
+
+    def get(self, draw_number):
+        """
+        회차 번호로 당첨 기록을 조회합니다.
+
+        Returns:
+            레코드 dict 또는 None
+        """
+        row = self.row_of(draw_number)
+        return self.record(row) if row is not None else None
+
+    def latest(self):
+        """가장 최근 회차 레코드를 반환합니다. (없으면 None)"""
+        return self.record(len(self) - 1) if len(self) else None
+
+    def recent(self, count):
+        """
+        최근 count개 회차만 담은 DrawHistory를 반환합니다.
+        """
+        start = max(0, len(self) - count)
+        return self.slice(start, len(self))
+
+    def slice(self, start, stop):
+        """행 범위 [start, stop)를 담은 DrawHistory를 반환합니다."""
+        return DrawHistory(self.draw_numbers[start:stop], self.numbers[start:stop], self.dates[start:stop])
+
+    @property
+    def prefix_counts(self):
+        """
+        번호별 누적 출현 횟수 (당첨 번호, 보너스 번호) 쌍.
+        각 배열은 (D + 1, 46)이며 [r, n]은 행 0..r-1에서 번호 n이 나온 횟수입니다.
+        """
+        if self._prefix_counts is None:
+            rows = np.arange(len(self))[:, None]
+            winning = np.zeros((len(self) + 1, 46), dtype=np.int32)
+            bonus = np.zeros((len(self) + 1, 46), dtype=np.int32)
+            winning[1:][rows, self.winning_numbers] = 1
+            bonus[1:][rows[:, 0], self.bonus_numbers] = 1
+            self._prefix_counts = (np.cumsum(winning, axis=0), np.cumsum(bonus, axis=0))
+        return self._prefix_counts
+
+    def frequency(self, start=0, stop=None, include_bonus=True):
+        """
+        행 범위 [start, stop)의 번호별 출현 횟수를 계산합니다.
+
+        Args:
+            start: 시작 행
+            stop: 끝 행 (없으면 마지막 행까지)
+            include_bonus: 보너스 번호 포함 여부
+
+        Returns:
+            (46,) int 배열 (인덱스 = 번호, 0번은 항상 0)
+        """
+        stop = len(self) if stop is None else min(stop, len(self))
+        start = max(0, min(start, stop))
+        winning, bonus = self.prefix_counts
+
+        counts = winning[stop] - winning[start]
+        if include_bonus:
+            counts = counts + (bonus[stop] - bonus[start])
+        return counts
+
+    def recent_frequency(self, count, include_bonus=True):
+        """최근 count개 회차의 번호별 출현 횟수 (46,) 배열을 반환합니다."""
+        return self.frequency(max(0, len(self) - count), len(self), include_bonus=include_bonus)
+
+    @property
+    def draw_bitsets(self):
+        """
+        번호 → 출현 회차 비트셋 역색인 (당첨 번호, 보너스 번호) 쌍.
+        각 배열은 (46, W) uint64이며 [n]의 r번 비트는 행 r에 번호 n이 나왔는지를 뜻합니다.
+        """
+        if self._draw_bitsets is None:
+            words = (len(self) + 63) // 64
+            winning = np.zeros((46, words * 64), dtype=bool)
+            bonus = np.zeros((46, words * 64), dtype=bool)
+            rows = np.arange(len(self))
+            winning[self.winning_numbers, rows[:, None]] = True
+            bonus[self.bonus_numbers, rows] = True
+            self._draw_bitsets = tuple(
+                np.packbits(bits, axis=1, bitorder='little').view(np.uint64)
+                for bits in (winning, bonus)
+            )
+        return self._draw_bitsets
+
+    def match_draws(self, combinations, min_matches=3):
+        """
+        조합들이 과거 회차에서 min_matches개 이상 맞춘 경우를 모두 찾습니다.
+        조합의 6개 번호 비트셋을 비트 단위 덧셈기로 더해 회차별 일치 개수를 한 번에 구합니다.
+
+        Args:
+            combinations: (N, 6) 번호 배열
+            min_matches: 최소 일치 개수 (1-6)
+
+        Returns:
+            (조합 인덱스, 행 인덱스, 일치 개수, 보너스 일치 여부) 배열 튜플
+        """
+        combinations = np.asarray(combinations, dtype=np.intp).reshape(-1, 6)
+        winning, bonus = self.draw_bitsets
+        bits = winning[combinations]  # (N, 6, W)
+
+        # 일치 개수의 비트 평면 (1, 2, 4)
+        ones = np.zeros(bits.shape[::2], dtype=np.uint64)
+        twos = np.zeros_like(ones)
+        fours = np.zeros_like(ones)
+        for k in range(bits.shape[1]):
+            carry = ones & bits[:, k]
+            ones ^= bits[:, k]
+            fours |= twos & carry
+            twos ^= carry
+
+        counts = _unpack_bitset(ones) + 2 * _unpack_bitset(twos) + 4 * _unpack_bitset(fours)
+        counts = counts[:, :len(self)]
+        ticket_idx, rows = np.nonzero(counts >= min_matches)
+
+        has_bonus = _unpack_bitset(np.bitwise_or.reduce(bonus[combinations], axis=1))[ticket_idx, rows]
+        return ticket_idx, rows, counts[ticket_idx, rows], has_bonus.astype(bool)
+
+    def to_records(self):
+        """JSON 레코드 리스트로 변환합니다."""
+        return list(self)
+
+    def content_hash(self):
+        """회차, 번호, 날짜 내용의 SHA-256 해시를 반환합니다."""
+        digest = hashlib.sha256()
+        digest.update(self.draw_numbers.tobytes())
+        digest.update(self.numbers.tobytes())
+        digest.update(self.dates.astype(np.int64).tobytes())
+        return digest.hexdigest()
+
+
+def _unpack_bitset(bitsets):
+    """(N, W) uint64 비트셋을 (N, W * 64) uint8 비트 배열로 펼칩니다."""
+    return np.unpackbits(np.ascontiguousarray(bitsets).view(np.uint8), axis=1, bitorder='little')
+
+
+def save_binary(history, path):
+    """
+    DrawHistory를 고정 폭 바이너리 파일로 저장합니다.
+    임시 파일에 쓴 뒤 교체하므로 기존 파일을 메모리 맵으로 연 프로세스에 영향이 없습니다.
+
+    Args:
+        history: DrawHistory 객체
+        path: 저장할 파일 경로
+    """
+    path = Path(path)
+    rows = np.zeros(len(history), dtype=ROW_DTYPE)
+    rows['draw_number'] = history.draw_numbers
+    rows['day'] = (history.dates - DATE_EPOCH).astype(np.int64)
+    rows['numbers'] = history.numbers
+
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, ROW_DTYPE.itemsize, len(rows)))
+        f.write(rows.tobytes())
+    os.replace(tmp_path, path)
+
+
+def open_binary(path):
+    """
+    바이너리 파일을 메모리 맵으로 열어 DrawHistory를 만듭니다.
+    번호 배열은 파일 페이지를 직접 가리키므로 여러 워커가 페이지 캐시 한 벌을 공유합니다.
+
+    Args:
+        path: 바이너리 파일 경로
+
+    Returns:
+        DrawHistory 객체 또는 None (파일이 없거나 형식이 맞지 않을 때)
+    """
+    path = Path(path)
+    if not path.exists():
+        return None
+
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size < BINARY_HEADER.size:
+            return None
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    magic, version, row_size, row_count = BINARY_HEADER.unpack_from(buffer)
+    valid = (
+        magic == BINARY_MAGIC and version == BINARY_VERSION and row_size == ROW_DTYPE.itemsize
+        and len(buffer) == BINARY_HEADER.size + row_size * row_count
+    )
+    if not valid:
+        # 형식이 맞지 않으면 배열을 만들기 전에 메모리 맵을 닫음
+        buffer.close()
+        return None
+
+    rows = np.frombuffer(buffer, dtype=ROW_DTYPE, count=row_count, offset=BINARY_HEADER.size)
+    return DrawHistory(rows['draw_number'], rows['numbers'], DATE_EPOCH + rows['day'].astype(np.int64))
+
+
+def as_history(lotto_data):
+    """
+    로또 데이터 리스트 또는 DrawHistory를 DrawHistory로 변환합니다.
+
+    Args:
+        lotto_data: 레코드 리스트 또는 DrawHistory
+
+    Returns:
+        DrawHistory 객체
+    """
+    if isinstance(lotto_data, DrawHistory):
+        return lotto_data
+    return DrawHistory.from_records(lotto_data or [])
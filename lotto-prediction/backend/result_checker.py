@@ -1,8 +1,15 @@
 """
 당첨 결과 확인 로직
 저장된 번호와 실제 당첨 번호를 비교
+check_results_bulk()는 여러 조합을 비트마스크 배열로 한 번에 비교합니다.
 """
 
+import json
+
+import numpy as np
+
+from bitmask import to_mask, popcount, to_mask_array, popcount_array
+
 def check_result(saved_numbers, winning_numbers, bonus_number):
     """
     저장된 번호와 당첨 번호를 비교하여 맞춘 개수 및 등수를 계산합니다.
@@ -20,12 +27,15 @@ def check_result(saved_numbers, winning_numbers, bonus_number):
             'prize': '5등' or None
         }
     """
-    # 당첨 번호와 일치하는 번호 찾기
-    matched_numbers = [n for n in saved_numbers if n in winning_numbers]
-    matched_count = len(matched_numbers)
+    saved_mask = to_mask(saved_numbers)
+    winning_mask = to_mask(winning_numbers)
+    
+    # 당첨 번호와 일치하는 번호 찾기 (비트마스크 AND 후 popcount)
+    matched_count = popcount(saved_mask & winning_mask)
+    matched_numbers = [n for n in saved_numbers if winning_mask >> n & 1]
     
     # 보너스 번호 확인
-    has_bonus = bonus_number in saved_numbers
+    has_bonus = bool(saved_mask >> bonus_number & 1)
     
     # 등수 판정
     prize = determine_prize(matched_count, has_bonus)
@@ -38,6 +48,124 @@ def check_result(saved_numbers, winning_numbers, bonus_number):
     }
 
 
+def check_results_bulk(combinations, winning_numbers, bonus_number):
+    """
+    여러 조합을 당첨 번호와 한 번에 비교합니다. (check_result의 배열 버전)
+    
+    Args:
+        combinations: (N, 6) 번호 배열 또는 (N,) 비트마스크 배열
+        winning_numbers: 당첨 번호 6개 (모든 조합 공통) 또는 조합별 (N, 6) 배열
+        bonus_number: 보너스 번호 (int) 또는 조합별 (N,) 배열
+    
+    Returns:
+        dict: {
+            'matched_count': (N,) 맞춘 개수 배열,
+            'has_bonus': (N,) 보너스 일치 여부 배열,
+            'prize_tier': (N,) 등수 배열 (1-5, 낙첨은 0)
+        }
+    """
+    masks = to_mask_array(combinations)
+    
+    winning = np.asarray(winning_numbers)
+    winning_masks = to_mask_array(winning) if winning.ndim == 2 else np.uint64(to_mask(winning_numbers))
+    bonus = np.asarray(bonus_number, dtype=np.uint64)
+    
+    matched_count = popcount_array(masks & winning_masks).astype(np.int8)
+    has_bonus = ((masks >> bonus) & np.uint64(1)).astype(bool)
+    
+    return {
+        'matched_count': matched_count,
+        'has_bonus': has_bonus,
+        'prize_tier': PRIZE_TIER_TABLE[matched_count, has_bonus.astype(np.int8)]
+    }
+
+
+def check_saved_rows(rows, history):
+    """
+    저장된 조합 행들을 각 행의 회차 당첨 번호와 한 번에 비교합니다.
+    (여러 사용자, 여러 회차가 섞여 있어도 됨. 당첨 번호가 없는 회차는 건너뜀)
+    
+    Args:
+        rows: saved_combinations 행 리스트 (id, numbers(JSON 문자열 또는 리스트), draw_number)
+        history: DrawHistory
+    
+    Returns:
+        결과 dict 리스트: [{'id', 'numbers', 'draw_number', 'matched_count', 'has_bonus', 'prize'}, ...]
+    """
+    checked = []
+    for row in rows:
+        numbers = row['numbers']
+        numbers = json.loads(numbers) if isinstance(numbers, str) else list(numbers)
+        draw_row = history.row_of(row['draw_number'])
+        if draw_row is not None:
+            checked.append((row['id'], numbers, row['draw_number'], draw_row))
+    
+    if not checked:
+        return []
+    
+    draw_rows = np.array([c[3] for c in checked])
+    bulk = check_results_bulk(
+        to_mask_array([to_mask(c[1]) for c in checked]),
+        history.winning_numbers[draw_rows],
+        history.bonus_numbers[draw_rows]
+    )
+    
+    return [
+        {
+            'id': row_id,
+            'numbers': numbers,
+            'draw_number': draw_number,
+            'matched_count': int(bulk['matched_count'][i]),
+            'has_bonus': bool(bulk['has_bonus'][i]),
+            'prize': PRIZE_NAMES[bulk['prize_tier'][i]]
+        }
+        for i, (row_id, numbers, draw_number, _) in enumerate(checked)
+    ]
+
+
+def find_historical_wins(combinations, history, min_matches=3):
+    """
+    조합들이 과거 회차에서 min_matches개 이상 맞춘 회차와 등수를 찾습니다.
+    
+    Args:
+        combinations: 조합 리스트 또는 (N, 6) 배열
+        history: DrawHistory
+        min_matches: 최소 일치 개수
+    
+    Returns:
+        조합별 결과 리스트: [[{'draw_number', 'draw_date', 'matched_count', 'has_bonus', 'prize'}, ...], ...]
+        (회차 오름차순)
+    
+    Raises:
+        ValueError: 조합이 1-45 사이 서로 다른 번호 6개가 아닐 때
+    """
+    arr = np.asarray(combinations, dtype=np.int64)
+    if arr.size == 0:
+        arr = arr.reshape(0, 6)
+    if arr.ndim != 2 or arr.shape[1] != 6 or (arr.size and (
+            arr.min() < 1 or arr.max() > 45 or (np.diff(np.sort(arr, axis=1), axis=1) == 0).any())):
+        raise ValueError('번호는 1-45 사이의 서로 다른 6개여야 합니다')
+    
+    results = [[] for _ in range(len(arr))]
+    if not len(arr) or not len(history):
+        return results
+    
+    ticket_idx, rows, matched, has_bonus = history.match_draws(arr, min_matches=min_matches)
+    tiers = PRIZE_TIER_TABLE[matched, has_bonus.astype(np.int8)]
+    
+    for i, row, count, bonus, tier in zip(ticket_idx.tolist(), rows.tolist(), matched.tolist(),
+                                          has_bonus.tolist(), tiers.tolist()):
+        results[i].append({
+            'draw_number': int(history.draw_numbers[row]),
+            'draw_date': str(history.dates[row]),
+            'matched_count': count,
+            'has_bonus': bonus,
+            'prize': PRIZE_NAMES[tier]
+        })
+    
+    return results
+
+
 def determine_prize(matched_count, has_bonus):
     """
     맞춘 개수와 보너스 여부로 등수를 판정합니다.
@@ -63,6 +191,16 @@ def determine_prize(matched_count, has_bonus):
         return None  # 낙첨
 
 
+# 등수 이름 (인덱스 0은 낙첨)
+PRIZE_NAMES = [None, '1등', '2등', '3등', '4등', '5등']
+
+# (맞춘 개수, 보너스 여부) → 등수 인덱스 (determine_prize로 채움)
+PRIZE_TIER_TABLE = np.array([
+    [PRIZE_NAMES.index(determine_prize(matched, has_bonus)) for has_bonus in (False, True)]
+    for matched in range(7)
+], dtype=np.int8)
+
+
 def get_prize_info(prize):
     """
     등수별 상금 정보를 반환합니다 (참고용).
@@ -71,37 +209,42 @@ def get_prize_info(prize):
         prize: 등수 문자열
     
     Returns:
-        dict: 상금 정보
+        dict: 상금 정보 (amount_value: 계산용 원 단위 금액, 1-2등은 평균적인 추정치)
     """
     prize_info = {
         '1등': {
             'name': '1등',
             'condition': '6개 번호 일치',
             'amount': '약 20억원 (변동)',
+            'amount_value': 2_000_000_000,
             'probability': '1/8,145,060'
         },
         '2등': {
             'name': '2등',
             'condition': '5개 번호 + 보너스 번호 일치',
             'amount': '약 5천만원 (변동)',
+            'amount_value': 50_000_000,
             'probability': '1/1,357,510'
         },
         '3등': {
             'name': '3등',
             'condition': '5개 번호 일치',
             'amount': '약 150만원 (고정)',
+            'amount_value': 1_500_000,
             'probability': '1/35,724'
         },
         '4등': {
             'name': '4등',
             'condition': '4개 번호 일치',
             'amount': '5만원 (고정)',
+            'amount_value': 50_000,
             'probability': '1/733'
         },
         '5등': {
             'name': '5등',
             'condition': '3개 번호 일치',
             'amount': '5천원 (고정)',
+            'amount_value': 5_000,
             'probability': '1/45'
         }
     }
@@ -3,42 +3,96 @@
 로또 명인의 비법을 기반으로 한 필터링 및 조합 생성
 """
 
-import itertools
+import random
+from math import comb
+import numpy as np
 from utils import (
     find_numbers_with_frequency,
     get_last_week_numbers,
-    get_recent_high_frequency_numbers,
-    has_consecutive_numbers,
-    check_odd_even_balance,
-    check_sum_range,
-    check_range_constraint,
-    has_multiples_of_three,
-    check_horizontal_bias,
-    check_vertical_bias
+    get_recent_high_frequency_numbers
 )
+from bitmask import to_mask
+from history_store import as_history
+from rule_spec import compile_rule_spec
+from filter_stats import FilterStats, GLOBAL_FILTER_STATS, apply_array_rule_chain, apply_rule_chain
+from combination_index import sample_combination_array, sample_combinations
+from vectorized_filters import as_combination_array
+from coverage import select_covering
+from sharded_generation import DEFAULT_SHARDS, generate_sharded
+
+# 필터 평가 방식: 'python' (스칼라 함수) 또는 'numpy' (배열 일괄 처리)
+FILTER_ENGINES = ('python', 'numpy')
+
+# 최종 조합 선택 방식: 'first' (필터 통과 순서대로) 또는 'coverage' (번호 쌍/삼중 커버리지 최대화)
+SELECTION_MODES = ('first', 'coverage')
+
+# 커버리지 선택 시 요청 수 대비 먼저 만들어 둘 조합 수 배율
+# (sample은 이만큼 추출 한도를 늘린 뒤 필터를 통과한 조합 전체를, search/sharded는 생성한 조합 전체를 후보로 사용)
+COVERAGE_CANDIDATE_FACTOR = 10
+
+# 스트리밍 생성 시 한 번에 추출해 필터링할 조합 수
+STREAM_BATCH_SIZE = 200
 
 
 class LottoRuleEngine:
     """로또 번호 조합 생성 및 필터링 엔진"""
     
-    def __init__(self, lotto_data):
+    def __init__(self, lotto_data, filter_bitmap=None, filter_engine='python',
+                 collect_stats=False, adaptive_order=False, rule_spec=None, analysis=None,
+                 workers=1, shards=DEFAULT_SHARDS):
         """
         Args:
-            lotto_data: 로또 당첨 번호 데이터 리스트
+            lotto_data: 로또 당첨 번호 데이터 (DrawHistory 또는 레코드 리스트)
+            filter_bitmap: 미리 계산된 FilterBitmap (없으면 필터를 직접 평가,
+                           규칙별 통계나 적응형 순서를 사용하면 규칙을 평가해야 하므로 사용하지 않음)
+            filter_engine: 비트맵이 없을 때의 필터 평가 방식 ('python' 또는 'numpy')
+            collect_stats: 규칙별 평가/탈락 횟수와 시간 기록 여부 ('numpy' 방식은 묶음 단위)
+            adaptive_order: 누적 통계를 바탕으로 규칙 평가 순서를 조정할지 여부
+            rule_spec: 컴파일된 규칙 명세 CompiledRuleSpec (없으면 기본 명세)
+            analysis: 미리 계산된 analyze_history() 결과 (있으면 분석을 건너뜀)
+            workers: 'sharded' 생성 방식의 프로세스 수
+            shards: 'sharded' 생성 방식에서 순위 공간을 나눌 샤드 수
         """
-        self.lotto_data = lotto_data
+        if filter_engine not in FILTER_ENGINES:
+            raise ValueError(f"Unknown filter engine: {filter_engine}")
+        
+        self.history = as_history(lotto_data)
+        self.rule_spec = rule_spec or compile_rule_spec()
+        
+        self.filter_engine = filter_engine
+        self.collect_stats = collect_stats or adaptive_order
+        
+        # 비트맵은 같은 규칙 명세로 만든 경우에만 사용
+        # (비트 조회는 규칙을 평가하지 않으므로 규칙별 통계를 기록할 때는 사용하지 않음)
+        if filter_bitmap is not None and (filter_bitmap.spec_hash != self.rule_spec.spec_hash
+                                          or self.collect_stats):
+            filter_bitmap = None
+        self.filter_bitmap = filter_bitmap
+        self.adaptive_order = adaptive_order
+        self.workers = workers
+        self.shards = shards
+        self.filter_stats = FilterStats()
+        self.rule_order = [name for name, _ in self.rule_spec.rules]
         self.core_numbers = []
         self.last_week_numbers = []
         self.exclude_numbers = []
+        self.candidate_pool = None
+        self.selectivity = None
+        self.analyzed = False
+        
+        if analysis is not None:
+            self.load_analysis(analysis)
         
     def find_core_numbers(self):
         """
         최근 6개월간 3-4회 등장한 핵심 번호를 찾습니다.
         """
+        candidates = self.rule_spec.candidates
+        self.candidate_pool = None
         self.core_numbers = find_numbers_with_frequency(
-            self.lotto_data,
-            min_count=3,
-            max_count=4
+            self.history,
+            min_count=candidates['core_min_count'],
+            max_count=candidates['core_max_count']
         )
         return self.core_numbers
     
@@ -46,7 +100,8 @@ class LottoRuleEngine:
         """
         지난주 당첨 번호를 가져옵니다.
         """
-        self.last_week_numbers = get_last_week_numbers(self.lotto_data)
+        self.candidate_pool = None
+        self.last_week_numbers = get_last_week_numbers(self.history)
         return self.last_week_numbers
     
     def find_exclude_numbers(self):
@@ -54,11 +109,13 @@ class LottoRuleEngine:
         제외해야 할 번호를 찾습니다.
         최근 10회차에서 3회 이상 등장한 번호 (39, 43 제외)
         """
+        candidates = self.rule_spec.candidates
+        self.candidate_pool = None
         self.exclude_numbers = get_recent_high_frequency_numbers(
-            self.lotto_data,
-            recent_count=10,
-            threshold=3,
-            exceptions=[39, 43]
+            self.history,
+            recent_count=candidates['recent_window'],
+            threshold=candidates['recent_threshold'],
+            exceptions=candidates['exceptions']
         )
         return self.exclude_numbers
 
@@ -70,25 +127,39 @@ class LottoRuleEngine:
         self.find_core_numbers()
         self.get_last_week_numbers()
         self.find_exclude_numbers()
+        self.selectivity = None
+        self.analyzed = True
         return {
             'core_numbers': self.core_numbers,
             'last_week_numbers': self.last_week_numbers,
-            'exclude_numbers': self.exclude_numbers
+            'exclude_numbers': self.exclude_numbers,
+            'candidate_pool': self.get_candidate_pool()
         }
-
     
-    def generate_base_combinations(self, num_combinations=100):
+    def load_analysis(self, analysis):
         """
-        기본 조합을 생성합니다.
-        지난주 번호 각각 + 핵심 번호로 조합
+        캐시된 분석 결과를 적용합니다. (analyze_history() 결과 형식)
         
         Args:
-            num_combinations: 생성할 조합 수
+            analysis: dict (선택적으로 'candidate_pool', 'selectivity' 포함)
+        """
+        self.core_numbers = analysis['core_numbers']
+        self.last_week_numbers = analysis['last_week_numbers']
+        self.exclude_numbers = analysis['exclude_numbers']
+        self.candidate_pool = analysis.get('candidate_pool')
+        self.selectivity = analysis.get('selectivity')
+        self.analyzed = True
+    
+    def get_candidate_pool(self):
+        """
+        조합 생성에 사용할 후보 번호 풀을 만듭니다.
+        지난주 번호 + 핵심 번호에서 제외 번호를 뺀 목록
         
         Returns:
-            생성된 조합 리스트
+            후보 번호 리스트
         """
-        combinations = []
+        if self.candidate_pool is not None:
+            return self.candidate_pool
         
         # 지난주 번호와 핵심 번호를 합쳐서 전체 후보군 생성
         # 중복 제거
@@ -107,71 +178,196 @@ class LottoRuleEngine:
             ]
             filtered_candidates.extend(extra_candidates[:6 - len(filtered_candidates)])
         
-        # 6개 조합 생성
+        self.candidate_pool = filtered_candidates
+        return filtered_candidates
+    
+    def get_exact_selectivity(self):
+        """
+        현재 후보 풀에서 필터를 통과하는 조합 수를 정확히 계산합니다.
+        (표본 추정치인 filter_rate 대신 실제 통과율)
+        
+        Returns:
+            dict: {
+                'pass_count': 통과 조합 수,
+                'total_combinations': 후보 풀의 전체 조합 수,
+                'filter_rate': 통과율 문자열
+            }
+        """
+        if self.selectivity is not None:
+            return self.selectivity
+        
+        candidates = self.get_candidate_pool()
+        total = comb(len(candidates), 6)
+        pass_count = count_valid_combinations(candidates, **self.rule_spec.filters)
+        
+        self.selectivity = {
+            'pass_count': pass_count,
+            'total_combinations': total,
+            'filter_rate': f"{pass_count / max(1, total) * 100:.1f}%"
+        }
+        return self.selectivity
+    
+    def generate_base_combinations(self, num_combinations=100, rng=random):
+        """
+        기본 조합을 생성합니다.
+        지난주 번호 각각 + 핵심 번호로 조합
+        
+        Args:
+            num_combinations: 생성할 조합 수
+            rng: 난수 생성기 (random 모듈 또는 random.Random 객체)
+        
+        Returns:
+            생성된 조합 리스트
+        """
+        combinations = []
+        filtered_candidates = self.get_candidate_pool()
+        
+        # 6개 조합 생성 (전체 조합을 만들지 않고 필요한 수만큼 추출)
         if len(filtered_candidates) >= 6:
-            all_combos = list(itertools.combinations(filtered_candidates, 6))
-            
-            # 제한된 수만큼만 가져오기
-            import random
-            if len(all_combos) > num_combinations * 10:
-                all_combos = random.sample(all_combos, num_combinations * 10)
-            
-            combinations = [list(combo) for combo in all_combos]
+            sampled = sample_combinations(filtered_candidates, num_combinations * 10, rng=rng)
+            combinations = [list(combo) for combo in sampled]
         
         return combinations
     
-    def apply_filters(self, combinations):
+    def apply_filters(self, combinations, vectorized=False):
         """
         생성된 조합에 필터링 규칙을 적용합니다.
         
         Args:
-            combinations: 조합 리스트
+            combinations: 조합 리스트 또는 (N, 6) 배열
+            vectorized: 설정과 관계없이 배열로 일괄 필터링할지 여부 (대량 후보용)
         
         Returns:
             필터링된 조합 리스트
         """
+        # 비트맵이 있으면 필터 평가 대신 비트 조회
+        if self.filter_bitmap is not None and not vectorized:
+            return [sorted(combo) for combo in combinations if self.filter_bitmap.passes(combo)]
+        
+        # 배열 일괄 처리
+        if vectorized or self.filter_engine == 'numpy':
+            arr = as_combination_array(combinations)
+            if self.collect_stats:
+                # 규칙별 통계 기록: 규칙마다 남은 행 전체를 한 번에 평가
+                passed = self._apply_rule_chain(
+                    self.rule_spec.vectorized_rules,
+                    lambda rules, stats: apply_array_rule_chain(arr, rules, stats=stats)
+                )
+            else:
+                passed = arr[self.rule_spec.vectorized(arr)]
+            return np.sort(passed, axis=1).tolist()
+        
+        # 규칙별 통계 기록: 규칙을 하나씩 일괄 적용
+        if self.collect_stats:
+            passed = self._apply_rule_chain(
+                self.rule_spec.rules,
+                lambda rules, stats: apply_rule_chain(combinations, rules, key=to_mask, stats=stats)
+            )
+            return [sorted(combo) for combo in passed]
+        
         filtered = []
+        predicate = self.rule_spec.predicate
         
         for combo in combinations:
-            # 1. 연속된 번호 3자리 이상 제외
-            if has_consecutive_numbers(combo, max_consecutive=3):
-                continue
-            
-            # 2. 홀짝 균형 체크 (모두 홀수 또는 모두 짝수 제외)
-            if not check_odd_even_balance(combo):
-                continue
-            
-            # 3. 합계 범위 체크 (121-160)
-            if not check_sum_range(combo, min_sum=121, max_sum=160):
-                continue
-            
-            # 4. 범위 제약 (첫 번호 ≤14, 마지막 번호 ≥35)
-            if not check_range_constraint(combo):
-                continue
-            
-            # 5. 3의 배수 포함 여부
-            if not has_multiples_of_three(combo):
-                continue
-            
-            # 6. 좌우 쏠림 방지
-            if not check_horizontal_bias(combo):
-                continue
-            
-            # 7. 상하 쏠림 방지
-            if not check_vertical_bias(combo):
-                continue
-            
-            # 모든 필터를 통과한 조합만 추가
-            filtered.append(sorted(combo))
+            # 모든 필터를 통과한 조합만 추가 (컴파일된 비트마스크 판정 함수)
+            if predicate(to_mask(combo)):
+                filtered.append(sorted(combo))
         
         return filtered
     
-    def generate_combinations(self, num_combinations=10):
+    def _apply_rule_chain(self, rules, apply):
+        """
+        규칙 순서를 정하고 apply(rules, stats)로 규칙을 적용한 뒤 규칙별 통계를 합칩니다.
+        
+        Args:
+            rules: (이름, 판정 함수) 리스트
+            apply: 정렬된 규칙과 FilterStats를 받아 통과한 조합을 반환하는 함수
+        
+        Returns:
+            apply의 반환값
+        """
+        if self.adaptive_order:
+            rules = GLOBAL_FILTER_STATS.order_rules(rules)
+        self.rule_order = [name for name, _ in rules]
+        
+        stats = FilterStats()
+        passed = apply(rules, stats)
+        self.filter_stats.merge(stats)
+        GLOBAL_FILTER_STATS.merge(stats)
+        return passed
+    
+    def generate_valid_combinations(self, num_combinations=10, rng=random, max_attempts=None, exclude=None):
+        """
+        필터를 모두 통과하는 조합만 직접 생성합니다.
+        후보 번호를 오름차순으로 하나씩 고르며 합계 범위, 첫/끝 번호, 연속 번호,
+        상하/좌우 쏠림 조건을 부분 조합 단계에서 미리 검사해 가지치기합니다.
+        
+        Args:
+            num_combinations: 생성할 조합 수
+            rng: 난수 생성기 (random 모듈 또는 random.Random 객체)
+            max_attempts: 최대 탐색 횟수 (기본값: num_combinations * 20)
+            exclude: 건너뛸 조합 비트마스크 (`in`과 len()을 지원하는 집합 또는 Bloom 필터)
+        
+        Returns:
+            (조합 리스트, 탐색 횟수) 튜플
+        """
+        statistics = {}
+        combinations = list(self._iter_valid_combinations(
+            num_combinations, 'search', statistics, exclude=exclude, rng=rng, max_attempts=max_attempts
+        ))
+        return combinations, statistics['search_attempts']
+    
+    def generate_sharded(self, num_combinations=10, seed=None, exclude=None):
+        """
+        후보 풀 조합의 순위 공간을 샤드로 나눠 프로세스 풀에서 병렬로 생성합니다.
+        (수만 장 단위 대량 생성용, 같은 시드와 샤드 수면 프로세스 수와 관계없이 같은 결과)
+        
+        Args:
+            num_combinations: 생성할 조합 수
+            seed: 난수 시드
+            exclude: 건너뛸 조합 비트마스크 (`in`과 len()을 지원하는 집합 또는 Bloom 필터)
+        
+        Returns:
+            (조합 리스트, 통계 정보) 튜플
+        """
+        if not self.analyzed:
+            self.analyze_history()
+        
+        result = generate_sharded(
+            self.get_candidate_pool(),
+            self.rule_spec.filters,
+            num_combinations,
+            pass_count=self.get_exact_selectivity()['pass_count'],
+            seed=seed,
+            workers=self.workers,
+            shards=self.shards,
+            exclude=exclude
+        )
+        
+        combinations = result['combinations'].tolist()
+        statistics = {
+            'total_generated': result['total_generated'],
+            'after_filtering': result['after_filtering'],
+            'returned': len(combinations),
+            'filter_rate': f"{result['after_filtering'] / max(1, result['total_generated']) * 100:.1f}%",
+            'shards': result['shards'],
+            'workers': self.workers
+        }
+        return combinations, statistics
+    
+    def generate_combinations(self, num_combinations=10, strategy='sample', selection='first', seed=None,
+                              exclude=None):
         """
         최종 조합을 생성합니다.
         
         Args:
             num_combinations: 생성할 조합 수
+            strategy: 'sample' (추출 후 필터링), 'search' (조건 탐색으로 직접 생성) 또는
+                      'sharded' (순위 공간을 샤드로 나눠 병렬 생성)
+            selection: 'first' (통과 순서대로) 또는 'coverage' (후보를 넉넉히 만든 뒤
+                       서로 다른 번호 쌍/삼중을 최대한 덮도록 선택)
+            seed: 난수 시드 (같은 데이터·규칙·시드·개수면 같은 결과, 없으면 매번 다름)
+            exclude: 건너뛸 조합 비트마스크 (`in`과 len()을 지원하는 집합 또는 Bloom 필터, 예: 이미 받은 조합)
         
         Returns:
             dict: {
@@ -182,31 +378,42 @@ class LottoRuleEngine:
                 'statistics': 통계 정보
             }
         """
-        # 1. 핵심 번호 찾기
-        self.find_core_numbers()
+        # 1-3. 핵심 번호, 지난주 번호, 제외 번호 (캐시된 분석 결과가 없을 때만)
+        if not self.analyzed:
+            self.analyze_history()
         
-        # 2. 지난주 번호 가져오기
-        self.get_last_week_numbers()
-        
-        # 3. 제외 번호 찾기
-        self.find_exclude_numbers()
+        if selection not in SELECTION_MODES:
+            raise ValueError(f"Unknown selection mode: {selection}")
         
-        # 4. 기본 조합 생성
-        base_combos = self.generate_base_combinations(num_combinations=num_combinations * 10)
+        # 커버리지 선택은 요청 수보다 많은 후보에서 고름 (sample은 필터를 통과한 조합 전체)
+        requested = num_combinations
+        limit = None
+        if selection == 'coverage':
+            num_combinations = requested * COVERAGE_CANDIDATE_FACTOR
+            if strategy == 'sample':
+                limit = float('inf')
         
-        # 5. 필터링 적용
-        filtered_combos = self.apply_filters(base_combos)
+        # 4-7. 조합 생성·필터링과 통계 정보 (스트리밍 생성과 같은 루프를 한 묶음으로 실행)
+        #      커버리지 후보는 수만 개라 배열로 추출·필터링
+        statistics = {}
+        final_combos = list(self._iter_valid_combinations(
+            num_combinations, strategy, statistics, seed=seed, exclude=exclude, limit=limit,
+            vectorized=selection == 'coverage'
+        ))
         
-        # 6. 요청된 수만큼만 반환
-        final_combos = filtered_combos[:num_combinations]
+        if selection == 'coverage':
+            covering = select_covering(final_combos, requested) if final_combos else {
+                'indices': [], 'pair_coverage': 0, 'triple_coverage': 0
+            }
+            statistics['coverage'] = {
+                'candidates': len(final_combos),
+                'pair_coverage': covering['pair_coverage'],
+                'triple_coverage': covering['triple_coverage']
+            }
+            final_combos = [final_combos[i] for i in covering['indices']]
+            statistics['returned'] = len(final_combos)
         
-        # 7. 통계 정보 생성
-        statistics = {
-            'total_generated': len(base_combos),
-            'after_filtering': len(filtered_combos),
-            'returned': len(final_combos),
-            'filter_rate': f"{len(filtered_combos) / max(1, len(base_combos)) * 100:.1f}%"
-        }
+        self._finish_statistics(statistics, selection, seed)
         
         return {
             'combinations': final_combos,
@@ -216,6 +423,161 @@ class LottoRuleEngine:
             'statistics': statistics
         }
     
+    def iter_combinations(self, num_combinations=10, strategy='sample', statistics=None, seed=None, exclude=None):
+        """
+        필터를 통과하는 조합을 찾는 즉시 하나씩 내보냅니다. (스트리밍 응답용)
+        전체 결과를 메모리에 모으지 않으며, 추출 개수 한도는 generate_combinations와 같습니다.
+        
+        Args:
+            num_combinations: 생성할 조합 수
+            strategy: 'sample' (작은 묶음으로 추출 후 필터링), 'search' (조건 탐색) 또는
+                      'sharded' (샤드별 병렬 생성 후 차례로 내보냄)
+            statistics: 끝난 뒤 통계 정보를 채울 dict (선택)
+            seed: 난수 시드 (같은 시드면 같은 순서로 내보냄)
+            exclude: 건너뛸 조합 비트마스크 (`in`과 len()을 지원하는 집합 또는 Bloom 필터)
+        
+        Yields:
+            오름차순 조합 리스트
+        """
+        if not self.analyzed:
+            self.analyze_history()
+        
+        generated = {}
+        yield from self._iter_valid_combinations(
+            num_combinations, strategy, generated, seed=seed, exclude=exclude, batch_size=STREAM_BATCH_SIZE
+        )
+        
+        if statistics is not None:
+            statistics.update(generated)
+            self._finish_statistics(statistics, 'first', seed)
+    
+    def _iter_valid_combinations(self, num_combinations, strategy, statistics, seed=None, exclude=None,
+                                 limit=None, batch_size=None, rng=None, max_attempts=None, vectorized=False):
+        """
+        generate_combinations와 iter_combinations가 함께 쓰는 생성 루프입니다.
+        필터를 통과한 서로 다른 조합을 차례로 내보내고, 끝나면 statistics에 생성 통계를 채웁니다.
+        
+        Args:
+            num_combinations: 생성할 조합 수 (추출·탐색 한도의 기준)
+            strategy: 'sample', 'search' 또는 'sharded'
+            statistics: 생성 통계를 채울 dict
+            seed: 난수 시드
+            exclude: 건너뛸 조합 비트마스크 (`in`과 len()을 지원하는 집합 또는 Bloom 필터)
+            limit: 내보낼 최대 조합 수 (기본값: num_combinations, sample 추출 한도는 그대로)
+            batch_size: sample 방식에서 한 번에 추출할 조합 수 (기본값: 추출 한도 전체를 한 번에)
+            rng: 난수 생성기 (기본값: seed로 만든 random.Random)
+            max_attempts: search 방식의 최대 탐색 횟수 (기본값: num_combinations * 20)
+            vectorized: sample 방식에서 배열로 추출·필터링할지 여부 (같은 시드면 같은 조합)
+        
+        Yields:
+            오름차순 조합 리스트
+        """
+        if strategy == 'sharded':
+            # 4. 순위 공간 샤드별 추출·필터링 (프로세스 풀, 결과가 한 번에 합쳐지므로 모두 만든 뒤 내보냄)
+            combos, sharded_statistics = self.generate_sharded(
+                num_combinations=num_combinations, seed=seed, exclude=exclude
+            )
+            yield from combos
+            statistics.update(sharded_statistics)
+            return
+        
+        if strategy not in ('sample', 'search'):
+            raise ValueError(f"Unknown generation strategy: {strategy}")
+        
+        if limit is None:
+            limit = num_combinations
+        
+        # 요청마다 독립된 난수 생성기 (전역 random 상태를 쓰지 않음)
+        if rng is None:
+            rng = random.Random(seed)
+        seen = set()
+        generated = 0
+        passed = 0
+        attempts = 0
+        pool = self.get_candidate_pool()
+        
+        if strategy == 'search':
+            # 4. 필터 조건을 만족하는 조합만 직접 탐색
+            candidates = sorted(pool)
+            filters = self.rule_spec.filters
+            
+            # 남은 r개를 고를 때 가능한 최소/최대 합계 계산용 누적합
+            prefix = [0]
+            for n in candidates:
+                prefix.append(prefix[-1] + n)
+            
+            # 마지막 번호 ≥35 를 만족할 수 없으면 탐색하지 않음
+            if max_attempts is None:
+                max_attempts = num_combinations * 20
+            feasible = len(candidates) >= 6 and candidates[-1] >= filters['last_min']
+            while feasible and len(seen) < limit and attempts < max_attempts:
+                attempts += 1
+                combo = _search_valid_combination(candidates, prefix, rng, filters)
+                if combo is None:
+                    # 무작위 탐색 순서와 관계없이 해가 없음
+                    break
+                key = to_mask(combo)
+                if key not in seen and (exclude is None or key not in exclude):
+                    seen.add(key)
+                    yield combo
+            
+            statistics.update({
+                'total_generated': len(seen),
+                'after_filtering': len(seen),
+                'returned': len(seen),
+                'search_attempts': attempts,
+                'filter_rate': '100.0%'
+            })
+            return
+        
+        if len(pool) >= 6:
+            # 4-5. 요청 수 × 100개까지 추출해 필터링 (batch_size씩 나눠 처리)
+            budget = num_combinations * 100
+            batch_size = batch_size or budget
+            while len(seen) < limit and generated < budget:
+                size = min(batch_size, budget - generated)
+                if vectorized:
+                    batch = sample_combination_array(pool, size, rng=rng)
+                    filtered = self.apply_filters(batch, vectorized=True)
+                else:
+                    batch = sample_combinations(pool, size, rng=rng)
+                    filtered = self.apply_filters([list(c) for c in batch])
+                generated += len(batch)
+                passed += len(filtered)
+                
+                # 6. 요청된 수만큼만 내보냄 (제외 조합은 필요한 만큼만 확인하며 건너뜀)
+                for combo in filtered:
+                    key = to_mask(combo)
+                    if key not in seen and (exclude is None or key not in exclude):
+                        seen.add(key)
+                        yield combo
+                        if len(seen) >= limit:
+                            break
+                if len(batch) < size:
+                    # 후보 풀의 조합이 묶음 크기보다 적어 모두 추출함
+                    break
+        
+        # 7. 통계 정보 생성
+        statistics.update({
+            'total_generated': generated,
+            'after_filtering': passed,
+            'returned': len(seen),
+            'filter_rate': f"{passed / max(1, generated) * 100:.1f}%"
+        })
+    
+    def _finish_statistics(self, statistics, selection, seed):
+        """선택 방식, 시드, 정확한 통과율, 규칙별 통계를 통계 정보에 추가합니다."""
+        statistics['selection'] = selection
+        statistics['seed'] = seed
+        
+        # 후보 풀 전체 기준 정확한 통과율
+        statistics['exact_filter_rate'] = self.get_exact_selectivity()['filter_rate']
+        
+        # 규칙별 통계
+        if self.collect_stats:
+            statistics['rule_stats'] = self.filter_stats.snapshot()
+            statistics['rule_order'] = self.rule_order
+    
     def explain_combination(self, combination):
         """
         특정 조합에 대한 설명을 생성합니다.
@@ -250,6 +612,173 @@ class LottoRuleEngine:
         return " | ".join(explanations)
 
 
+def count_valid_combinations(candidates, max_consecutive=3, odd_even_balance=True,
+                             min_sum=121, max_sum=160, first_max=14, last_min=35,
+                             min_multiples_of_three=1, max_adjacent_columns=4,
+                             top_range_max=21, max_top_numbers=4):
+    """
+    후보 번호로 만들 수 있는 6개 조합 중 필터를 모두 통과하는 조합 수를
+    전체 조합을 나열하지 않고 동적 계획법으로 정확히 계산합니다.
+    
+    1부터 45까지 번호를 차례로 포함/제외하며 상태
+    (선택 개수, 합계, 홀수 개수, 연속 길이, 이전 열 개수, 현재 열 개수, 3의 배수 개수)
+    별 경우의 수를 누적합니다.
+    
+    Args:
+        candidates: 후보 번호 리스트
+        나머지 인자: 필터 임계값 (utils.passes_all_filters와 같음)
+    
+    Returns:
+        필터를 통과하는 조합 수
+    """
+    candidate_set = set(candidates)
+    states = {(0, 0, 0, 0, 0, 0, 0): 1}
+    
+    for n in range(1, 46):
+        # 새 열 시작 (1-9, 10-19, 20-29, 30-39, 40-45)
+        if n % 10 == 0:
+            states = _merge_states(
+                ((k, total, odd, run, cur, 0, threes), ways)
+                for (k, total, odd, run, prev, cur, threes), ways in states.items()
+            )
+        
+        next_states = {}
+        for (k, total, odd, run, prev, cur, threes), ways in states.items():
+            # n을 고르지 않는 경우: 연속이 끊김
+            key = (k, total, odd, 0, prev, cur, threes)
+            next_states[key] = next_states.get(key, 0) + ways
+            
+            if n not in candidate_set or k == 6:
+                continue
+            
+            # n을 고르는 경우
+            if total + n > max_sum:
+                continue
+            if run + 1 >= max_consecutive:  # 연속 번호
+                continue
+            if n <= top_range_max and k + 1 > max_top_numbers:  # 상하 쏠림 (지금까지 고른 번호는 모두 ≤ n)
+                continue
+            if prev + cur + 1 > max_adjacent_columns:  # 좌우 쏠림
+                continue
+            
+            # 3의 배수 개수는 필요한 개수까지만 구분
+            new_threes = min(threes + (n % 3 == 0), min_multiples_of_three)
+            key = (k + 1, total + n, odd + n % 2, run + 1, prev, cur + 1, new_threes)
+            next_states[key] = next_states.get(key, 0) + ways
+        
+        states = next_states
+        
+        # 첫 번호 ≤14: 14 이후에도 아무것도 고르지 않았으면 탈락
+        if n == first_max:
+            states = {key: ways for key, ways in states.items() if key[0] > 0}
+        
+        # 마지막 번호 ≥35: 34까지 이미 6개를 모두 골랐으면 탈락
+        if n == last_min - 1:
+            states = {key: ways for key, ways in states.items() if key[0] < 6}
+    
+    return sum(
+        ways for (k, total, odd, run, prev, cur, threes), ways in states.items()
+        if k == 6 and total >= min_sum and threes >= min_multiples_of_three
+        and (not odd_even_balance or 0 < odd < 6)
+    )
+
+
+def _merge_states(items):
+    """같은 상태의 경우의 수를 합칩니다."""
+    merged = {}
+    for key, ways in items:
+        merged[key] = merged.get(key, 0) + ways
+    return merged
+
+
+def _search_valid_combination(candidates, prefix, rng, filters):
+    """
+    무작위 순서의 깊이 우선 탐색으로 필터를 통과하는 조합 하나를 찾습니다.
+    
+    Args:
+        candidates: 오름차순 정렬된 후보 번호 리스트
+        prefix: candidates의 누적합 (prefix[i] = sum(candidates[:i]))
+        rng: 난수 생성기
+        filters: 규칙 명세의 filters 항목
+    
+    Returns:
+        조합 리스트 또는 None (해가 없을 때)
+    """
+    m = len(candidates)
+    chosen = []
+    columns = [0] * 5
+    
+    min_sum, max_sum = filters['min_sum'], filters['max_sum']
+    first_max, last_min = filters['first_max'], filters['last_min']
+    max_consecutive = filters['max_consecutive']
+    top_range_max, max_top = filters['top_range_max'], filters['max_top_numbers']
+    max_adjacent = filters['max_adjacent_columns']
+    
+    def dfs(start, total, run, top_count):
+        depth = len(chosen)
+        if depth == 6:
+            # 홀짝 균형, 3의 배수 포함은 완성된 조합에서 확인
+            odd_count = sum(n % 2 for n in chosen)
+            if filters['odd_even_balance'] and odd_count in (0, 6):
+                return False
+            return sum(1 for n in chosen if n % 3 == 0) >= filters['min_multiples_of_three']
+        
+        remaining = 5 - depth  # 이번 번호 이후에 더 골라야 할 개수
+        
+        # 합계 하한: 이번 번호 + 바로 뒤 remaining개가 160을 넘으면 더 큰 번호도 불가
+        end = m - remaining
+        for i in range(start, m - remaining):
+            if total + prefix[i + 1 + remaining] - prefix[i] > max_sum:
+                end = i
+                break
+        
+        order = list(range(start, end))
+        rng.shuffle(order)
+        
+        for i in order:
+            n = candidates[i]
+            
+            # 첫 번호 ≤14, 마지막 번호 ≥35
+            if depth == 0 and n > first_max:
+                continue
+            if depth == 5 and n < last_min:
+                continue
+            
+            # 합계 상한: 가장 큰 remaining개를 더해도 121 미만이면 불가
+            if total + n + prefix[m] - prefix[m - remaining] < min_sum:
+                continue
+            
+            # 연속 번호 3개 이상 불가
+            new_run = run + 1 if chosen and n == chosen[-1] + 1 else 1
+            if new_run >= max_consecutive:
+                continue
+            
+            # 상하 쏠림: 1-21 범위 5개 이상 불가
+            new_top = top_count + (1 if n <= top_range_max else 0)
+            if new_top > max_top:
+                continue
+            
+            # 좌우 쏠림: 인접한 두 열 합계 5개 이상 불가
+            col = n // 10
+            if col > 0 and columns[col - 1] + columns[col] + 1 > max_adjacent:
+                continue
+            if col < 4 and columns[col] + 1 + columns[col + 1] > max_adjacent:
+                continue
+            
+            chosen.append(n)
+            columns[col] += 1
+            if dfs(i + 1, total + n, new_run, new_top):
+                return True
+            chosen.pop()
+            columns[col] -= 1
+        
+        return False
+    
+    if dfs(0, 0, 0, 0):
+        return list(chosen)
+    return None
+
+
 def main():
     """테스트 실행"""
     import json
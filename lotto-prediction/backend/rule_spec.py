@@ -0,0 +1,354 @@
+"""
+선언형 규칙 명세 모듈
+규칙 임계값을 JSON 명세로 정의하고, 명세를 한 번 컴파일해
+스칼라(비트마스크) / 배열(NumPy) 판정 함수로 만들어 해시별로 캐시합니다.
+"""
+
+import copy
+import hashlib
+import json
+import re
+import threading
+from functools import partial
+from pathlib import Path
+
+import numpy as np
+
+from bitmask import to_mask, popcount, range_mask, mask_sum, ODD_MASK, MULTIPLE_OF_THREE_MASK, ADJACENT_COLUMN_MASKS
+from vectorized_filters import (
+    filter_mask,
+    has_consecutive_numbers,
+    check_odd_even_balance,
+    check_sum_range,
+    check_range_constraint,
+    has_multiples_of_three,
+    check_horizontal_bias,
+    check_vertical_bias
+)
+
+# 기본 규칙 명세 (로또 명인의 비법)
+DEFAULT_RULE_SPEC = {
+    'candidates': {
+        'core_min_count': 3,      # 핵심 번호: 3-4회 등장
+        'core_max_count': 4,
+        'recent_window': 10,      # 제외 번호: 최근 10회차에서
+        'recent_threshold': 3,    # 3회 이상 등장
+        'exceptions': [39, 43]    # 제외하지 않을 번호
+    },
+    'filters': {
+        'max_consecutive': 3,     # 3자리 이상 연속 제외
+        'odd_even_balance': True, # 모두 홀수/모두 짝수 제외
+        'min_sum': 121,           # 합계 범위
+        'max_sum': 160,
+        'first_max': 14,          # 첫 번호 ≤14
+        'last_min': 35,           # 마지막 번호 ≥35
+        'min_multiples_of_three': 1,
+        'max_adjacent_columns': 4,  # 인접한 2개 열에 최대 4개
+        'top_range_max': 21,      # 1-21 범위에
+        'max_top_numbers': 4      # 최대 4개
+    }
+}
+
+# 프로필 이름 (파일명으로 사용하므로 제한)
+PROFILE_NAME_PATTERN = re.compile(r'^[A-Za-z0-9_-]+$')
+
+_compiled_cache = {}
+_profile_cache = {}
+_cache_lock = threading.Lock()
+
+
+class CompiledRuleSpec:
+    """컴파일된 규칙 명세 (판정 함수 묶음)"""
+
+    def __init__(self, spec, spec_hash):
+        """
+        Args:
+            spec: 기본값이 채워진 규칙 명세
+            spec_hash: 명세 해시 (캐시 키)
+        """
+        self.spec = spec
+        self.spec_hash = spec_hash
+        self.candidates = spec['candidates']
+        self.filters = spec['filters']
+        self.rules = _build_rules(self.filters)
+        self.predicate = _build_predicate(self.rules)
+        self.vectorized = partial(filter_mask, **self.filters)
+        self.vectorized_rules = _build_vectorized_rules(self.filters)
+
+    def passes(self, numbers):
+        """번호 리스트가 모든 필터를 통과하는지 확인합니다."""
+        return self.predicate(to_mask(numbers))
+
+
+def normalize_rule_spec(spec):
+    """
+    명세에 기본값을 채우고 알 수 없는 항목과 값의 형식을 검사합니다.
+
+    Args:
+        spec: 규칙 명세 dict (일부 항목만 있어도 됨)
+
+    Returns:
+        기본값이 채워진 새 명세 dict
+
+    Raises:
+        ValueError: 알 수 없는 섹션이나 항목이 있거나 값의 형식·범위가 잘못되었을 때
+    """
+    normalized = copy.deepcopy(DEFAULT_RULE_SPEC)
+
+    spec = spec or {}
+    if not isinstance(spec, dict):
+        raise ValueError("Rule spec must be an object")
+
+    for section, values in spec.items():
+        if section not in normalized:
+            raise ValueError(f"Unknown rule spec section: {section}")
+        if not isinstance(values, dict):
+            raise ValueError(f"Rule spec section must be an object: {section}")
+        for key, value in values.items():
+            if key not in normalized[section]:
+                raise ValueError(f"Unknown rule spec entry: {section}.{key}")
+            _check_value_type(f'{section}.{key}', value, normalized[section][key])
+            normalized[section][key] = value
+
+    _check_value_ranges(normalized)
+    return normalized
+
+
+def _check_value_type(name, value, default):
+    """명세 값이 기본값과 같은 형식(불리언, 정수, 정수 리스트)인지 검사합니다."""
+    if isinstance(default, bool):
+        valid = isinstance(value, bool)
+    elif isinstance(default, int):
+        valid = isinstance(value, int) and not isinstance(value, bool)
+    else:
+        valid = isinstance(value, list) and all(
+            isinstance(item, int) and not isinstance(item, bool) for item in value
+        )
+    if not valid:
+        raise ValueError(f"Invalid rule spec value for {name}: {value!r}")
+
+
+def _check_value_ranges(spec):
+    """
+    판정 경로(스칼라, 컴파일, 배열, 동적 계획법)가 같은 결과를 내는 범위의 값인지 검사합니다.
+
+    Raises:
+        ValueError: 범위를 벗어난 값이 있을 때
+    """
+    candidates, filters = spec['candidates'], spec['filters']
+
+    def require(condition, message):
+        if not condition:
+            raise ValueError(f"Invalid rule spec: {message}")
+
+    # 연속 길이 1은 모든 조합을 연속으로 보게 되어 경로마다 해석이 달라짐
+    require(filters['max_consecutive'] >= 2, 'filters.max_consecutive must be at least 2')
+    for key in ('first_max', 'last_min', 'top_range_max'):
+        require(1 <= filters[key] <= 45, f'filters.{key} must be between 1 and 45')
+    require(filters['min_sum'] <= filters['max_sum'], 'filters.min_sum must not exceed filters.max_sum')
+    for key in ('min_multiples_of_three', 'max_adjacent_columns', 'max_top_numbers'):
+        require(filters[key] >= 0, f'filters.{key} must not be negative')
+
+    for key in ('core_min_count', 'core_max_count', 'recent_window', 'recent_threshold'):
+        require(candidates[key] >= 0, f'candidates.{key} must not be negative')
+    require(all(1 <= n <= 45 for n in candidates['exceptions']), 'candidates.exceptions must be between 1 and 45')
+
+
+def rule_spec_hash(spec):
+    """정규화된 명세의 SHA-256 해시를 계산합니다."""
+    canonical = json.dumps(normalize_rule_spec(spec), sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def compile_rule_spec(spec=None):
+    """
+    규칙 명세를 판정 함수로 컴파일합니다. 같은 명세는 해시로 캐시된 결과를 재사용합니다.
+
+    Args:
+        spec: 규칙 명세 dict (None이면 기본 명세)
+
+    Returns:
+        CompiledRuleSpec 객체
+    """
+    normalized = normalize_rule_spec(spec)
+    spec_hash = rule_spec_hash(normalized)
+
+    with _cache_lock:
+        compiled = _compiled_cache.get(spec_hash)
+        if compiled is None:
+            compiled = CompiledRuleSpec(normalized, spec_hash)
+            _compiled_cache[spec_hash] = compiled
+
+    return compiled
+
+
+def load_rule_profile(name, profiles_dir):
+    """
+    프로필 디렉토리의 <name>.json 명세를 불러와 컴파일합니다.
+    파일이 바뀌지 않았으면 이전 결과를 재사용합니다.
+
+    Args:
+        name: 프로필 이름 (None 또는 'default'면 기본 명세)
+        profiles_dir: 프로필 JSON 파일 디렉토리
+
+    Returns:
+        CompiledRuleSpec 객체
+
+    Raises:
+        ValueError: 이름이 잘못되었거나 프로필이 없을 때
+    """
+    if not name or name == 'default':
+        return compile_rule_spec()
+
+    if not PROFILE_NAME_PATTERN.match(name):
+        raise ValueError(f"Invalid rule profile name: {name}")
+
+    path = Path(profiles_dir) / f'{name}.json'
+    if not path.exists():
+        raise ValueError(f"Unknown rule profile: {name}")
+
+    mtime = path.stat().st_mtime_ns
+    with _cache_lock:
+        cached = _profile_cache.get(name)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    with open(path, 'r', encoding='utf-8') as f:
+        compiled = compile_rule_spec(json.load(f))
+
+    with _cache_lock:
+        _profile_cache[name] = (mtime, compiled)
+    return compiled
+
+
+def _build_rules(filters):
+    """규칙별 비트마스크 판정 함수 리스트를 만듭니다. (이름, 함수)"""
+    shifts = tuple(range(1, filters['max_consecutive']))
+    odd_even_balance = filters['odd_even_balance']
+    min_sum, max_sum = filters['min_sum'], filters['max_sum']
+    first_mask = range_mask(1, filters['first_max'])
+    last_mask = range_mask(filters['last_min'], 45)
+    min_multiples = filters['min_multiples_of_three']
+    max_adjacent = filters['max_adjacent_columns']
+    top_mask = range_mask(1, filters['top_range_max'])
+    max_top = filters['max_top_numbers']
+    adjacent_masks = tuple(ADJACENT_COLUMN_MASKS)
+
+    def consecutive(mask):
+        run = mask
+        for s in shifts:
+            run &= mask >> s
+        return not run
+
+    def odd_even(mask):
+        return not odd_even_balance or 0 < popcount(mask & ODD_MASK) < popcount(mask)
+
+    def sum_range(mask):
+        return min_sum <= mask_sum(mask) <= max_sum
+
+    def range_constraint(mask):
+        return bool(mask & first_mask) and bool(mask & last_mask)
+
+    def multiples_of_three(mask):
+        return popcount(mask & MULTIPLE_OF_THREE_MASK) >= min_multiples
+
+    def horizontal_bias(mask):
+        for m in adjacent_masks:
+            if popcount(mask & m) > max_adjacent:
+                return False
+        return True
+
+    def vertical_bias(mask):
+        return popcount(mask & top_mask) <= max_top
+
+    return [
+        ('consecutive', consecutive),
+        ('odd_even', odd_even),
+        ('sum_range', sum_range),
+        ('range_constraint', range_constraint),
+        ('multiples_of_three', multiples_of_three),
+        ('horizontal_bias', horizontal_bias),
+        ('vertical_bias', vertical_bias)
+    ]
+
+
+def _build_vectorized_rules(filters):
+    """_build_rules와 같은 이름·순서의 배열 판정 함수 리스트를 만듭니다. (이름, (N, 6) 배열 → bool 배열)"""
+    def consecutive(arr):
+        return ~has_consecutive_numbers(arr, max_consecutive=filters['max_consecutive'])
+
+    def odd_even(arr):
+        if not filters['odd_even_balance']:
+            return np.ones(len(arr), dtype=bool)
+        return check_odd_even_balance(arr)
+
+    return [
+        ('consecutive', consecutive),
+        ('odd_even', odd_even),
+        ('sum_range', partial(check_sum_range, min_sum=filters['min_sum'], max_sum=filters['max_sum'])),
+        ('range_constraint', partial(check_range_constraint, first_max=filters['first_max'],
+                                     last_min=filters['last_min'])),
+        ('multiples_of_three', partial(has_multiples_of_three, min_count=filters['min_multiples_of_three'])),
+        ('horizontal_bias', partial(check_horizontal_bias, max_adjacent=filters['max_adjacent_columns'])),
+        ('vertical_bias', partial(check_vertical_bias, top_max=filters['top_range_max'],
+                                  max_count=filters['max_top_numbers']))
+    ]
+
+
+def _build_predicate(rules):
+    """_build_rules의 규칙을 모두 통과하는지 확인하는 비트마스크 판정 함수를 만듭니다."""
+    checks = tuple(rule for _, rule in rules)
+
+    def predicate(mask):
+        for check in checks:
+            if not check(mask):
+                return False
+        return True
+
+    return predicate
+
+
+def main():
+    """경계값 명세에서 스칼라 / 컴파일 / 배열 / 동적 계획법 판정 결과가 같은지 검증합니다."""
+    from itertools import combinations
+
+    from rule_engine import count_valid_combinations
+    from utils import passes_all_filters
+
+    # 양 끝 번호와 연속 번호, 열마다 번호를 고루 포함한 후보 (C(22, 6) = 74,613개 조합)
+    candidates = [1, 2, 3, 5, 6, 9, 10, 12, 14, 15, 18, 21, 22, 27, 30, 33, 35, 36, 39, 42, 44, 45]
+    arr = np.array(list(combinations(candidates, 6)), dtype=np.int16)
+    masks = [to_mask(c) for c in arr.tolist()]
+
+    boundary_filters = [
+        {},
+        {'max_consecutive': 2},
+        {'first_max': 1}, {'first_max': 45},
+        {'last_min': 1}, {'last_min': 45},
+        {'top_range_max': 1}, {'top_range_max': 45},
+        {'max_top_numbers': 0}, {'max_top_numbers': 6},
+        {'min_sum': 130, 'max_sum': 130}, {'min_sum': 21, 'max_sum': 255},
+        {'min_multiples_of_three': 0}, {'min_multiples_of_three': 6},
+        {'max_adjacent_columns': 0}, {'max_adjacent_columns': 6},
+        {'odd_even_balance': False}
+    ]
+
+    failed = 0
+    for overrides in boundary_filters:
+        compiled = compile_rule_spec({'filters': overrides})
+        filters = compiled.filters
+        scalar = sum(passes_all_filters(c, **filters) for c in arr.tolist())
+        predicate = sum(map(compiled.predicate, masks))
+        vectorized = int(compiled.vectorized(arr).sum())
+        counted = count_valid_combinations(candidates, **filters)
+
+        ok = scalar == predicate == vectorized == counted
+        failed += not ok
+        print(f"{'✓' if ok else '✗'} {overrides or 'default'}: "
+              f"scalar {scalar:,}, compiled {predicate:,}, vectorized {vectorized:,}, dp {counted:,}")
+
+    print(f"\n{'All paths agree' if not failed else f'{failed} mismatching spec(s)'}")
+
+
+if __name__ == '__main__':
+    main()
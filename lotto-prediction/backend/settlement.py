@@ -0,0 +1,161 @@
+"""
+회차 정산 모듈
+새 회차 당첨 번호가 들어오면 그 회차의 저장된 조합 전체를 한 번에 확인하고,
+결과(checked, matched_count, prize)를 하나의 트랜잭션에서 executemany로 기록합니다.
+"""
+
+import queue
+import threading
+
+from database import get_db_connection
+from history_store import DrawHistory, as_history
+from result_checker import check_saved_rows
+
+# 한 번에 확인할 행 수
+SETTLEMENT_BATCH_SIZE = 10000
+
+
+def settle_draw(draw_number, lotto_data, conn=None, batch_size=SETTLEMENT_BATCH_SIZE, user_id=None):
+    """
+    한 회차의 확인되지 않은 저장 조합을 모두 정산합니다.
+
+    Args:
+        draw_number: 정산할 회차
+        lotto_data: 해당 회차가 포함된 로또 데이터 (DrawHistory 또는 레코드 리스트)
+        conn: sqlite3 연결 (없으면 새로 열고 닫음)
+        batch_size: 한 번에 확인할 행 수
+        user_id: 이 사용자의 조합만 정산 (없으면 회차 전체)
+
+    Returns:
+        dict: {'draw_number', 'checked', 'prizes': {등수: 개수}}
+    """
+    history = as_history(lotto_data)
+    summary = {'draw_number': draw_number, 'checked': 0, 'prizes': {}}
+    if history.row_of(draw_number) is None:
+        return summary
+
+    own_conn = conn is None
+    if own_conn:
+        conn = get_db_connection()
+
+    try:
+        # 같은 연결에서 읽는 중에 고치지 않도록 먼저 모두 읽음
+        query = 'SELECT id, numbers, draw_number FROM saved_combinations WHERE draw_number = ? AND checked = 0'
+        params = (draw_number,)
+        if user_id is not None:
+            query += ' AND user_id = ?'
+            params += (user_id,)
+        rows = conn.execute(query, params).fetchall()
+
+        # 읽은 조합 전체를 하나의 트랜잭션으로 기록
+        with conn:
+            for start in range(0, len(rows), batch_size):
+                checked = check_saved_rows(rows[start:start + batch_size], history)
+                conn.executemany(
+                    'UPDATE saved_combinations SET checked = 1, matched_count = ?, prize = ? WHERE id = ?',
+                    [(r['matched_count'], r['prize'], r['id']) for r in checked]
+                )
+
+                summary['checked'] += len(checked)
+                for r in checked:
+                    if r['prize']:
+                        summary['prizes'][r['prize']] = summary['prizes'].get(r['prize'], 0) + 1
+    finally:
+        if own_conn:
+            conn.close()
+
+    return summary
+
+
+def settle_pending(lotto_data, conn=None):
+    """
+    당첨 번호가 있는 회차 중 확인되지 않은 조합이 남은 회차를 모두 정산합니다.
+
+    Args:
+        lotto_data: 로또 데이터 (DrawHistory 또는 레코드 리스트)
+        conn: sqlite3 연결 (없으면 새로 열고 닫음)
+
+    Returns:
+        회차별 정산 결과 리스트
+    """
+    history = as_history(lotto_data)
+
+    own_conn = conn is None
+    if own_conn:
+        conn = get_db_connection()
+
+    try:
+        cursor = conn.execute('SELECT DISTINCT draw_number FROM saved_combinations WHERE checked = 0')
+        draw_numbers = sorted(row['draw_number'] for row in cursor.fetchall())
+        return [
+            settle_draw(draw_number, history, conn=conn)
+            for draw_number in draw_numbers
+            if history.row_of(draw_number) is not None
+        ]
+    finally:
+        if own_conn:
+            conn.close()
+
+
+class SettlementJob:
+    """새 회차를 받아 백그라운드 스레드에서 정산하는 작업"""
+
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self.results = []
+
+    def start(self):
+        """작업 스레드를 시작합니다. (이미 실행 중이면 무시)"""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='settlement', daemon=True)
+                self._thread.start()
+        return self
+
+    def submit(self, record):
+        """
+        정산할 회차를 추가합니다. (LottoDataCollector.update_data의 on_new_draw로 사용)
+
+        Args:
+            record: {'draw_number', 'draw_date', 'winning_numbers', 'bonus_number'}
+        """
+        self._queue.put(record)
+
+    def join(self):
+        """추가된 회차가 모두 정산될 때까지 기다립니다."""
+        self._queue.join()
+
+    def _run(self):
+        while True:
+            record = self._queue.get()
+            try:
+                result = settle_draw(record['draw_number'], DrawHistory.from_records([record]))
+                self.results.append(result)
+                print(f"✓ Settled draw {result['draw_number']}: {result['checked']} combinations {result['prizes']}")
+            except Exception as e:
+                print(f"Settlement failed for draw {record.get('draw_number')}: {e}")
+            finally:
+                self._queue.task_done()
+
+
+# 프로세스 전체 정산 작업
+SETTLEMENT_JOB = SettlementJob()
+
+
+def main():
+    """당첨 번호를 업데이트하고 새 회차와 밀린 회차를 정산합니다. (주간 배치용)"""
+    from data_collector import LottoDataCollector
+
+    job = SETTLEMENT_JOB.start()
+    collector = LottoDataCollector()
+    data = collector.update_data(on_new_draw=job.submit)
+    job.join()
+
+    for result in settle_pending(data):
+        print(f"✓ Settled draw {result['draw_number']}: {result['checked']} combinations {result['prizes']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,161 @@
+"""
+샤드 병렬 조합 생성 모듈
+후보 풀 조합의 순위 공간(0 ~ C(풀 크기, 6)-1)을 연속 구간(샤드)으로 나누고,
+샤드마다 독립된 시드로 같은 비율만큼 순위를 추출해 배열로 필터링합니다.
+샤드 결과를 샤드 순서대로 합친 뒤 시드로 섞어 고르므로, 같은 시드와 샤드 수면
+프로세스 수와 관계없이 같은 결과가 나옵니다.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from math import ceil, comb
+
+import numpy as np
+
+from bitmask import to_mask_array
+from combination_index import PICK_COUNT, unrank_array
+from vectorized_filters import filter_mask
+
+# 순위 공간을 나눌 샤드 수 (결과는 샤드 수에 따라 정해지고 프로세스 수와는 무관)
+DEFAULT_SHARDS = 16
+
+# 필요한 통과 조합 수 대비 추출 여유 (추출 비율 = 요청 수 × 여유 / 통과 조합 수)
+SHARD_OVERSAMPLE = 1.2
+SHARD_SLACK = 64
+
+
+def shard_bounds(total, shards):
+    """
+    순위 공간 [0, total)을 거의 같은 크기의 연속 구간으로 나눕니다.
+
+    Returns:
+        [(시작 순위, 끝 순위), ...] (끝 순위는 포함하지 않음)
+    """
+    shards = max(1, min(shards, total))
+    edges = [total * i // shards for i in range(shards + 1)]
+    return list(zip(edges[:-1], edges[1:]))
+
+
+def _generate_shard(pool, filters, lo, hi, rate, seed_seq):
+    """
+    한 샤드의 순위 구간에서 rate 비율만큼 순위를 중복 없이 추출해 필터링합니다.
+
+    Args:
+        pool: 오름차순 후보 번호 배열
+        filters: 규칙 명세의 'filters' 섹션
+        lo, hi: 순위 구간 [lo, hi)
+        rate: 추출 비율 (1이면 구간 전체)
+        seed_seq: numpy SeedSequence
+
+    Returns:
+        (추출한 순위 수, 필터를 통과한 조합 (K, 6) int16 배열) 튜플
+    """
+    rng = np.random.default_rng(seed_seq)
+    size = hi - lo
+    sample_size = min(size, ceil(size * rate))
+
+    if sample_size == size:
+        ranks = np.arange(lo, hi, dtype=np.int64)
+    else:
+        ranks = lo + np.sort(rng.choice(size, size=sample_size, replace=False))
+
+    # 순위 → 풀 안의 위치 (1부터) → 번호
+    arr = pool[unrank_array(ranks) - 1]
+    return sample_size, arr[filter_mask(arr, **filters)].astype(np.int16)
+
+
+def generate_sharded(pool, filters, count, pass_count=None, seed=None, workers=1, shards=DEFAULT_SHARDS,
+                     exclude=None):
+    """
+    필터를 통과하는 서로 다른 조합을 샤드별로 병렬 생성합니다.
+
+    Args:
+        pool: 후보 번호 리스트
+        filters: 규칙 명세의 'filters' 섹션
+        count: 생성할 조합 수
+        pass_count: 후보 풀에서 필터를 통과하는 조합 수 (없으면 구간 전체를 필터링)
+        seed: 난수 시드 (같은 시드와 샤드 수면 같은 결과)
+        workers: 프로세스 수 (1이면 현재 프로세스에서 실행)
+        shards: 순위 공간을 나눌 샤드 수
+        exclude: 건너뛸 조합 비트마스크 (`in`과 len()을 지원하는 집합 또는 Bloom 필터)
+
+    Returns:
+        dict: {
+            'combinations': (K, 6) int16 배열 (K ≤ count),
+            'total_generated': 추출한 순위 수,
+            'after_filtering': 필터를 통과한 조합 수,
+            'shards': 샤드 수
+        }
+    """
+    pool = np.array(sorted(pool), dtype=np.int64)
+    total = comb(len(pool), PICK_COUNT)
+    if not total or not count or pass_count == 0:
+        return {
+            'combinations': np.zeros((0, PICK_COUNT), dtype=np.int16),
+            'total_generated': 0,
+            'after_filtering': 0,
+            'shards': 0
+        }
+
+    bounds = shard_bounds(total, shards)
+    seeds = np.random.SeedSequence(seed).spawn(len(bounds) + 1)
+
+    # 모든 샤드가 같은 비율로 추출하므로 합친 결과는 전체에서 균등하게 추출한 것과 같음
+    # (제외될 조합만큼 더 추출)
+    needed = count + (len(exclude) if exclude is not None else 0)
+    rate = 1.0 if pass_count is None else min(1.0, (needed * SHARD_OVERSAMPLE + SHARD_SLACK) / pass_count)
+
+    args = ([pool] * len(bounds), [filters] * len(bounds),
+            [lo for lo, _ in bounds], [hi for _, hi in bounds],
+            [rate] * len(bounds), seeds[:-1])
+    workers = max(1, min(workers, len(bounds)))
+    if workers == 1:
+        results = list(map(_generate_shard, *args))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_generate_shard, *args))
+
+    # 샤드 순서대로 합친 뒤 마지막 시드로 섞어 요청 수만큼 선택
+    valid = np.concatenate([block for _, block in results])
+    after_filtering = len(valid)
+    if exclude is not None and len(exclude):
+        keep = np.fromiter((int(mask) not in exclude for mask in to_mask_array(valid)), dtype=bool, count=len(valid))
+        valid = valid[keep]
+    order = np.random.default_rng(seeds[-1]).permutation(len(valid))[:count]
+
+    return {
+        'combinations': valid[order],
+        'total_generated': int(sum(sampled for sampled, _ in results)),
+        'after_filtering': after_filtering,
+        'shards': len(bounds)
+    }
+
+
+def main():
+    """대량 조합 생성 (python sharded_generation.py --tickets 50000 --workers 4)"""
+    import argparse
+    import time
+    from pathlib import Path
+
+    from dataset import LottoDataset
+    from rule_engine import LottoRuleEngine
+
+    parser = argparse.ArgumentParser(description='샤드 병렬 조합 생성')
+    parser.add_argument('--tickets', type=int, default=50000, help='생성할 조합 수')
+    parser.add_argument('--workers', type=int, default=1, help='프로세스 수')
+    parser.add_argument('--shards', type=int, default=DEFAULT_SHARDS, help='샤드 수')
+    parser.add_argument('--seed', type=int, default=None, help='난수 시드')
+    args = parser.parse_args()
+
+    snapshot = LottoDataset(Path(__file__).parent / '../data/lotto_history.json').get()
+    engine = LottoRuleEngine(snapshot.history, workers=args.workers, shards=args.shards)
+
+    start = time.time()
+    _, stats = engine.generate_sharded(num_combinations=args.tickets, seed=args.seed)
+    elapsed = time.time() - start
+
+    print(f"✓ {stats['returned']:,}개 조합 생성 ({elapsed:.2f}s, 샤드 {stats['shards']}개, 프로세스 {stats['workers']}개)")
+    print(f"  - 추출 {stats['total_generated']:,} → 통과 {stats['after_filtering']:,} ({stats['filter_rate']})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,191 @@
+"""
+몬테카를로 기대값 시뮬레이터
+무작위 추첨을 NumPy로 대량 생성하고 조합 묶음 전체를 비트마스크 popcount로 채점해
+등수별 확률과 기대 당첨금을 추정합니다. (등수 판정: result_checker.determine_prize,
+금액: get_prize_info)
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from bitmask import to_mask_array, popcount_array
+from result_checker import PRIZE_NAMES, PRIZE_TIER_TABLE, get_prize_info
+
+# 등수 인덱스별 당첨금 (낙첨 0원)
+PRIZE_AMOUNTS = np.array(
+    [0] + [get_prize_info(name)['amount_value'] for name in PRIZE_NAMES[1:]],
+    dtype=np.float64
+)
+
+# 조합 1장 가격 (원)
+TICKET_PRICE = 1000
+
+# 청크 하나에서 만드는 (추첨 × (난수 키 + 조합)) 원소 수 상한 (메모리 사용량 제한)
+DEFAULT_CHUNK_CELLS = 4_000_000
+
+# 추첨 1회를 만들 때 쓰는 난수 키 수 (random_draws의 (count, 45) 배열)
+DRAW_KEY_WIDTH = 45
+
+
+def random_draws(rng, count):
+    """
+    무작위 추첨 count회를 생성합니다.
+
+    Args:
+        rng: numpy Generator
+        count: 추첨 횟수
+
+    Returns:
+        (당첨 번호 마스크 (count,) uint64, 보너스 번호 (count,) uint64) 튜플
+    """
+    # 45개 난수 중 가장 작은 7개의 위치 = 중복 없는 7개 번호 (7번째가 보너스)
+    keys = rng.random((count, DRAW_KEY_WIDTH))
+    picked = np.argpartition(keys, 6, axis=1)[:, :7] + 1
+    return to_mask_array(picked[:, :6]), picked[:, 6].astype(np.uint64)
+
+
+def _simulate_shard(ticket_masks, draws, seed_seq, chunk_cells):
+    """
+    한 샤드의 추첨을 청크 단위로 채점해 집계합니다.
+
+    Returns:
+        dict: {'tier_counts', 'draw_wins', 'payout_sum', 'payout_sq_sum', 'draws'}
+    """
+    rng = np.random.default_rng(seed_seq)
+    # 추첨 1회당 난수 키 45개와 조합 수만큼의 원소를 만드므로 둘을 합쳐 청크 크기를 정함
+    chunk = max(1, chunk_cells // (DRAW_KEY_WIDTH + len(ticket_masks)))
+
+    tier_counts = np.zeros(len(PRIZE_NAMES), dtype=np.int64)
+    draw_wins = np.zeros(len(PRIZE_NAMES), dtype=np.int64)
+    payout_sum = 0.0
+    payout_sq_sum = 0.0
+
+    for start in range(0, draws, chunk):
+        winning, bonus = random_draws(rng, min(chunk, draws - start))
+
+        matched = popcount_array(winning[:, None] & ticket_masks[None, :])
+        has_bonus = (ticket_masks[None, :] >> bonus[:, None]) & np.uint64(1)
+        tiers = PRIZE_TIER_TABLE[matched, has_bonus.astype(np.int8)]
+
+        tier_counts += np.bincount(tiers.ravel(), minlength=len(PRIZE_NAMES))
+
+        # 추첨마다 조합 묶음이 받은 최고 등수 (등수 인덱스가 작을수록 높은 등수)
+        best = np.where(tiers > 0, tiers, len(PRIZE_NAMES)).min(axis=1)
+        draw_wins += np.bincount(best, minlength=len(PRIZE_NAMES) + 1)[:len(PRIZE_NAMES)]
+
+        payout = PRIZE_AMOUNTS[tiers].sum(axis=1)
+        payout_sum += payout.sum()
+        payout_sq_sum += np.square(payout).sum()
+
+    return {
+        'tier_counts': tier_counts,
+        'draw_wins': draw_wins,
+        'payout_sum': payout_sum,
+        'payout_sq_sum': payout_sq_sum,
+        'draws': draws
+    }
+
+
+def simulate(combinations, draws=1_000_000, seed=None, workers=1, chunk_cells=DEFAULT_CHUNK_CELLS):
+    """
+    조합 묶음의 기대값을 몬테카를로로 추정합니다.
+
+    Args:
+        combinations: 조합 리스트, (N, 6) 배열 또는 (N,) 비트마스크 배열
+        draws: 시뮬레이션할 추첨 횟수
+        seed: 난수 시드 (같은 시드와 workers면 같은 결과)
+        workers: 프로세스 수 (1이면 현재 프로세스에서 실행)
+        chunk_cells: 청크 하나의 (추첨 × (난수 키 45개 + 조합)) 원소 수 상한
+
+    Returns:
+        dict: {
+            'tickets', 'draws',
+            'tiers': {등수: {'per_ticket_probability', 'set_probability', 'count'}},
+            'win_probability': 조합 묶음이 추첨 1회에 하나라도 당첨될 확률,
+            'expected_payout': 추첨 1회당 기대 당첨금 (원),
+            'payout_std_error': 기대 당첨금의 표준오차,
+            'cost': 조합 묶음 가격 (원),
+            'expected_return': 기대 당첨금 / 가격
+        }
+    """
+    ticket_masks = to_mask_array(combinations)
+    if not len(ticket_masks):
+        raise ValueError('조합이 필요합니다')
+
+    workers = max(1, min(workers, draws))
+    seeds = np.random.SeedSequence(seed).spawn(workers)
+    shard_draws = [draws // workers + (1 if i < draws % workers else 0) for i in range(workers)]
+
+    if workers == 1:
+        shards = [_simulate_shard(ticket_masks, shard_draws[0], seeds[0], chunk_cells)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            shards = list(executor.map(
+                _simulate_shard,
+                [ticket_masks] * workers, shard_draws, seeds, [chunk_cells] * workers
+            ))
+
+    tier_counts = sum(shard['tier_counts'] for shard in shards)
+    draw_wins = sum(shard['draw_wins'] for shard in shards)
+    payout_sum = sum(shard['payout_sum'] for shard in shards)
+    payout_sq_sum = sum(shard['payout_sq_sum'] for shard in shards)
+
+    expected = payout_sum / draws
+    variance = max(0.0, payout_sq_sum / draws - expected ** 2)
+    cost = len(ticket_masks) * TICKET_PRICE
+
+    return {
+        'tickets': len(ticket_masks),
+        'draws': draws,
+        'tiers': {
+            PRIZE_NAMES[tier]: {
+                'per_ticket_probability': float(tier_counts[tier] / (draws * len(ticket_masks))),
+                'set_probability': float(draw_wins[tier] / draws),
+                'count': int(tier_counts[tier])
+            }
+            for tier in range(1, len(PRIZE_NAMES))
+        },
+        'win_probability': float(draw_wins[1:].sum() / draws),
+        'expected_payout': float(expected),
+        'payout_std_error': float((variance / draws) ** 0.5),
+        'cost': cost,
+        'expected_return': float(expected / cost)
+    }
+
+
+def main():
+    """기대값 시뮬레이션 (python simulator.py --tickets 10 --draws 1000000 --workers 4)"""
+    import argparse
+    import time
+    from pathlib import Path
+
+    from combination_index import FilterBitmap
+    from dataset import LottoDataset
+    from rule_engine import LottoRuleEngine
+
+    parser = argparse.ArgumentParser(description='조합 묶음 기대값 시뮬레이션')
+    parser.add_argument('--tickets', type=int, default=10, help='생성할 조합 수')
+    parser.add_argument('--draws', type=int, default=1_000_000, help='시뮬레이션할 추첨 횟수')
+    parser.add_argument('--workers', type=int, default=1, help='프로세스 수')
+    parser.add_argument('--seed', type=int, default=None, help='난수 시드')
+    args = parser.parse_args()
+
+    snapshot = LottoDataset(Path(__file__).parent / '../data/lotto_history.json').get()
+    engine = LottoRuleEngine(snapshot.history, filter_bitmap=FilterBitmap.load())
+    combinations = engine.generate_combinations(num_combinations=args.tickets)['combinations']
+
+    start = time.time()
+    result = simulate(combinations, draws=args.draws, seed=args.seed, workers=args.workers)
+    elapsed = time.time() - start
+
+    print(f"📊 {result['tickets']}개 조합 × {result['draws']:,}회 추첨 ({elapsed:.1f}s)")
+    for name, tier in result['tiers'].items():
+        print(f"  - {name}: 조합당 {tier['per_ticket_probability']:.3e}, 묶음 {tier['set_probability']:.3e}")
+    print(f"  - 묶음 당첨 확률: {result['win_probability']:.4f}")
+    print(f"  - 기대 당첨금: {result['expected_payout']:,.0f}원 (±{result['payout_std_error']:,.0f}) "
+          f"/ 구입 {result['cost']:,}원 → {result['expected_return'] * 100:.1f}%")
+
+
+if __name__ == '__main__':
+    main()
@@ -4,28 +4,23 @@
 
 from collections import Counter
 
+from history_store import as_history
+
 
 def get_number_frequency(lotto_data, include_bonus=True):
     """
     로또 번호별 출현 빈도를 계산합니다.
     
     Args:
-        lotto_data: 로또 데이터 리스트
+        lotto_data: 로또 데이터 (DrawHistory 또는 레코드 리스트)
         include_bonus: 보너스 번호 포함 여부
     
     Returns:
         Counter 객체 (번호: 출현 횟수)
     """
-    frequency = Counter()
-    
-    for draw in lotto_data:
-        for num in draw['winning_numbers']:
-            frequency[num] += 1
-        
-        if include_bonus:
-            frequency[draw['bonus_number']] += 1
+    counts = as_history(lotto_data).frequency(include_bonus=include_bonus)
     
-    return frequency
+    return Counter({n: int(count) for n, count in enumerate(counts) if count})
 
 
 def find_numbers_with_frequency(lotto_data, min_count=3, max_count=4):
@@ -33,7 +28,7 @@ def find_numbers_with_frequency(lotto_data, min_count=3, max_count=4):
     특정 횟수만큼 등장한 번호들을 찾습니다.
     
     Args:
-        lotto_data: 로또 데이터 리스트
+        lotto_data: 로또 데이터 (DrawHistory 또는 레코드 리스트)
         min_count: 최소 등장 횟수
         max_count: 최대 등장 횟수
     
@@ -55,16 +50,16 @@ def get_last_week_numbers(lotto_data):
     지난주(가장 최근) 당첨 번호를 가져옵니다.
     
     Args:
-        lotto_data: 로또 데이터 리스트
+        lotto_data: 로또 데이터 (DrawHistory 또는 레코드 리스트)
     
     Returns:
         지난주 당첨 번호 리스트
     """
-    if not lotto_data:
+    # 가장 최근 회차 (회차순으로 정렬되어 있으므로 마지막 행)
+    latest = as_history(lotto_data).latest()
+    if latest is None:
         return []
     
-    # 가장 최근 회차
-    latest = max(lotto_data, key=lambda x: x['draw_number'])
     return latest['winning_numbers']
 
 
@@ -73,7 +68,7 @@ def get_recent_high_frequency_numbers(lotto_data, recent_count=10, threshold=3,
     최근 N회차에서 threshold 이상 등장한 번호를 찾습니다.
     
     Args:
-        lotto_data: 로또 데이터 리스트
+        lotto_data: 로또 데이터 (DrawHistory 또는 레코드 리스트)
         recent_count: 최근 몇 회차를 볼지
         threshold: 제외할 최소 등장 횟수
         exceptions: 제외하지 않을 번호 리스트
@@ -84,20 +79,41 @@ def get_recent_high_frequency_numbers(lotto_data, recent_count=10, threshold=3,
     if exceptions is None:
         exceptions = [39, 43]
     
-    # 최근 N회차 데이터 추출
-    sorted_data = sorted(lotto_data, key=lambda x: x['draw_number'], reverse=True)
-    recent_data = sorted_data[:recent_count]
-    
-    # 빈도 계산
-    frequency = get_number_frequency(recent_data, include_bonus=False)
+    # 최근 N회차 빈도 (누적 횟수의 차)
+    frequency = as_history(lotto_data).recent_frequency(recent_count, include_bonus=False)
     
     # threshold 이상 등장한 번호 중 예외가 아닌 것
     high_freq = [
-        num for num, count in frequency.items()
-        if count >= threshold and num not in exceptions
+        num for num in range(1, 46)
+        if frequency[num] >= threshold and num not in exceptions
     ]
     
-    return sorted(high_freq)
+    return high_freq
+
+
+def get_window_frequencies(lotto_data, windows=(10, 26, 52, None), include_bonus=True):
+    """
+    여러 최근 회차 구간의 번호별 빈도 벡터를 계산합니다.
+    
+    Args:
+        lotto_data: 로또 데이터 (DrawHistory 또는 레코드 리스트)
+        windows: 최근 회차 수 리스트 (None은 전체 기간)
+        include_bonus: 보너스 번호 포함 여부
+    
+    Returns:
+        dict: {'10': [1번 횟수, ..., 45번 횟수], ..., 'all': [...]}
+    """
+    history = as_history(lotto_data)
+    
+    result = {}
+    for window in windows:
+        if window is None:
+            counts = history.frequency(include_bonus=include_bonus)
+        else:
+            counts = history.recent_frequency(window, include_bonus=include_bonus)
+        result['all' if window is None else str(window)] = counts[1:].tolist()
+    
+    return result
 
 
 def has_consecutive_numbers(numbers, max_consecutive=3):
@@ -166,35 +182,38 @@ def check_sum_range(numbers, min_sum=121, max_sum=160):
     return min_sum <= total <= max_sum
 
 
-def check_range_constraint(numbers):
+def check_range_constraint(numbers, first_max=14, last_min=35):
     """
     첫 번째 번호 ≤14, 마지막 번호 ≥35 확인
     
     Args:
         numbers: 정렬된 번호 리스트
+        first_max: 첫 번째 번호의 최댓값
+        last_min: 마지막 번호의 최솟값
     
     Returns:
         True: 조건 충족, False: 조건 불충족
     """
     sorted_nums = sorted(numbers)
-    return sorted_nums[0] <= 14 and sorted_nums[-1] >= 35
+    return sorted_nums[0] <= first_max and sorted_nums[-1] >= last_min
 
 
-def has_multiples_of_three(numbers):
+def has_multiples_of_three(numbers, min_count=1):
     """
     3의 배수가 적절히 포함되어 있는지 확인합니다.
     
     Args:
         numbers: 번호 리스트
+        min_count: 최소 포함 개수
     
     Returns:
-        True: 3의 배수가 1개 이상 포함, False: 없음
+        True: 3의 배수가 min_count개 이상 포함, False: 부족
     """
     multiples = [n for n in numbers if n % 3 == 0]
-    return len(multiples) >= 1
+    return len(multiples) >= min_count
 
 
-def check_horizontal_bias(numbers):
+def check_horizontal_bias(numbers, max_adjacent=4):
     """
     좌우 쏠림 방지 - 로또 용지의 좌우 세로 2줄에 번호를 몰아 쓰지 않았는지 확인
     
@@ -203,6 +222,7 @@ def check_horizontal_bias(numbers):
     
     Args:
         numbers: 번호 리스트
+        max_adjacent: 인접한 2개 열에 허용되는 최대 개수
     
     Returns:
         True: 쏠림 없음, False: 쏠림 있음
@@ -218,28 +238,82 @@ def check_horizontal_bias(numbers):
     
     counts = [sum(1 for n in numbers if n in col) for col in columns]
     
-    # 인접한 2개 열에 5개 이상 몰려있으면 좌우 쏠림
+    # 인접한 2개 열에 max_adjacent개를 넘게 몰려있으면 좌우 쏠림
     for i in range(len(counts) - 1):
-        if counts[i] + counts[i+1] >= 5:
+        if counts[i] + counts[i+1] > max_adjacent:
             return False
     
     return True
 
 
-def check_vertical_bias(numbers):
+def check_vertical_bias(numbers, top_max=21, max_count=4):
     """
     상하 쏠림 방지 - 위 세로 3줄에 번호를 몰아 쓰지 않았는지 확인
     
     Args:
         numbers: 번호 리스트
+        top_max: 위쪽 영역의 마지막 번호
+        max_count: 위쪽 영역에 허용되는 최대 개수
     
     Returns:
         True: 쏠림 없음, False: 쏠림 있음
     """
     # 1-21 범위 (첫 3줄)에 5개 이상 있으면 상하 쏠림
-    top_numbers = [n for n in numbers if n <= 21]
+    top_numbers = [n for n in numbers if n <= top_max]
+    
+    if len(top_numbers) > max_count:
+        return False
+    
+    return True
+
+
+def passes_all_filters(numbers, max_consecutive=3, odd_even_balance=True,
+                       min_sum=121, max_sum=160, first_max=14, last_min=35,
+                       min_multiples_of_three=1, max_adjacent_columns=4,
+                       top_range_max=21, max_top_numbers=4):
+    """
+    7가지 정적 필터를 모두 통과하는지 확인합니다.
+    (번호 조합 자체에만 의존하는 규칙들, 인자는 규칙 명세의 filters 항목과 같음)
+    
+    Args:
+        numbers: 번호 리스트
+        max_consecutive: 이 개수 이상 연속되면 탈락
+        odd_even_balance: 모두 홀수/모두 짝수 조합 제외 여부
+        min_sum, max_sum: 합계 범위
+        first_max, last_min: 첫 번호 최댓값, 마지막 번호 최솟값
+        min_multiples_of_three: 3의 배수 최소 개수
+        max_adjacent_columns: 인접한 2개 열에 허용되는 최대 개수
+        top_range_max, max_top_numbers: 위쪽 영역의 마지막 번호와 허용 개수
+    
+    Returns:
+        True: 모든 필터 통과, False: 하나 이상 탈락
+    """
+    # 1. 연속된 번호 3자리 이상 제외
+    if has_consecutive_numbers(numbers, max_consecutive=max_consecutive):
+        return False
+    
+    # 2. 홀짝 균형 체크 (모두 홀수 또는 모두 짝수 제외)
+    if odd_even_balance and not check_odd_even_balance(numbers):
+        return False
+    
+    # 3. 합계 범위 체크 (121-160)
+    if not check_sum_range(numbers, min_sum=min_sum, max_sum=max_sum):
+        return False
+    
+    # 4. 범위 제약 (첫 번호 ≤14, 마지막 번호 ≥35)
+    if not check_range_constraint(numbers, first_max=first_max, last_min=last_min):
+        return False
+    
+    # 5. 3의 배수 포함 여부
+    if not has_multiples_of_three(numbers, min_count=min_multiples_of_three):
+        return False
+    
+    # 6. 좌우 쏠림 방지
+    if not check_horizontal_bias(numbers, max_adjacent=max_adjacent_columns):
+        return False
     
-    if len(top_numbers) >= 5:
+    # 7. 상하 쏠림 방지
+    if not check_vertical_bias(numbers, top_max=top_range_max, max_count=max_top_numbers):
         return False
     
     return True
@@ -0,0 +1,163 @@
+"""
+NumPy 기반 일괄 필터 모듈
+(N, 6) 정수 배열 전체에 utils.py의 필터 규칙을 배열 연산으로 적용합니다.
+각 함수는 utils.py의 동일한 이름의 스칼라 함수와 같은 결과를 냅니다.
+"""
+
+import numpy as np
+
+# 번호별 로또 용지 열 번호 (1-9, 10-19, 20-29, 30-39, 40-45 → 0~4)
+NUM_COLUMNS = 5
+COLUMN_OF = (np.arange(46) // 10).astype(np.int8)
+
+
+def as_combination_array(combinations):
+    """
+    조합 리스트를 (N, 6) 정수 배열로 변환합니다.
+
+    Args:
+        combinations: 조합 리스트 또는 배열
+
+    Returns:
+        (N, 6) int16 배열
+    """
+    arr = np.asarray(combinations, dtype=np.int16)
+    if arr.size == 0:
+        return arr.reshape(0, 6)
+    return arr
+
+
+def has_consecutive_numbers(arr, max_consecutive=3):
+    """
+    연속된 번호가 max_consecutive개 이상 있는 행을 찾습니다.
+
+    Returns:
+        (N,) bool 배열 (True: 연속 번호가 있음)
+    """
+    sorted_arr = np.sort(arr, axis=1)
+    is_next = np.diff(sorted_arr, axis=1) == 1
+
+    run = np.ones(len(arr), dtype=np.int16)
+    found = np.zeros(len(arr), dtype=bool)
+
+    for i in range(is_next.shape[1]):
+        run = np.where(is_next[:, i], run + 1, 1)
+        found |= run >= max_consecutive
+
+    return found
+
+
+def check_odd_even_balance(arr):
+    """모두 홀수이거나 모두 짝수인 행을 False로 표시합니다."""
+    odd_count = (arr % 2 == 1).sum(axis=1)
+    return (odd_count != 0) & (odd_count != arr.shape[1])
+
+
+def check_sum_range(arr, min_sum=121, max_sum=160):
+    """번호 합계가 범위 내에 있는 행을 True로 표시합니다."""
+    total = arr.sum(axis=1)
+    return (total >= min_sum) & (total <= max_sum)
+
+
+def check_range_constraint(arr, first_max=14, last_min=35):
+    """첫 번째 번호 ≤14, 마지막 번호 ≥35 를 만족하는 행을 True로 표시합니다."""
+    return (arr.min(axis=1) <= first_max) & (arr.max(axis=1) >= last_min)
+
+
+def has_multiples_of_three(arr, min_count=1):
+    """3의 배수가 min_count개 이상 포함된 행을 True로 표시합니다."""
+    return (arr % 3 == 0).sum(axis=1) >= min_count
+
+
+def check_horizontal_bias(arr, max_adjacent=4):
+    """인접한 2개 열에 max_adjacent개를 넘게 몰리지 않은 행을 True로 표시합니다."""
+    columns = COLUMN_OF[arr]
+    valid = np.ones(len(arr), dtype=bool)
+
+    # 열별 개수를 하나씩 구해 바로 앞 열과 더함 (전체 개수 배열을 만들지 않음)
+    prev = (columns == 0).sum(axis=1, dtype=np.int8)
+    for c in range(1, NUM_COLUMNS):
+        count = (columns == c).sum(axis=1, dtype=np.int8)
+        valid &= prev + count <= max_adjacent
+        prev = count
+    return valid
+
+
+def check_vertical_bias(arr, top_max=21, max_count=4):
+    """1-21 범위에 max_count개를 넘게 몰리지 않은 행을 True로 표시합니다."""
+    return (arr <= top_max).sum(axis=1) <= max_count
+
+
+def filter_mask(arr, max_consecutive=3, odd_even_balance=True,
+                min_sum=121, max_sum=160, first_max=14, last_min=35,
+                min_multiples_of_three=1, max_adjacent_columns=4,
+                top_range_max=21, max_top_numbers=4):
+    """
+    7가지 필터를 모두 적용한 통과 마스크를 계산합니다.
+    (utils.passes_all_filters의 배열 버전, 인자도 같음)
+
+    Args:
+        arr: (N, 6) 정수 배열
+
+    Returns:
+        (N,) bool 배열 (True: 모든 필터 통과)
+    """
+    arr = as_combination_array(arr)
+
+    mask = ~has_consecutive_numbers(arr, max_consecutive=max_consecutive)
+    if odd_even_balance:
+        mask &= check_odd_even_balance(arr)
+    mask &= check_sum_range(arr, min_sum=min_sum, max_sum=max_sum)
+    mask &= check_range_constraint(arr, first_max=first_max, last_min=last_min)
+    mask &= has_multiples_of_three(arr, min_count=min_multiples_of_three)
+    mask &= check_horizontal_bias(arr, max_adjacent=max_adjacent_columns)
+    mask &= check_vertical_bias(arr, top_max=top_range_max, max_count=max_top_numbers)
+
+    return mask
+
+
+def main():
+    """스칼라 필터와 결과가 일치하는지 검증합니다."""
+    import random
+    import utils
+
+    rules = [
+        ('has_consecutive_numbers', lambda a: has_consecutive_numbers(a, 3),
+         lambda c: utils.has_consecutive_numbers(c, 3)),
+        ('check_odd_even_balance', check_odd_even_balance, utils.check_odd_even_balance),
+        ('check_sum_range', check_sum_range, utils.check_sum_range),
+        ('check_range_constraint', check_range_constraint, utils.check_range_constraint),
+        ('has_multiples_of_three', has_multiples_of_three, utils.has_multiples_of_three),
+        ('check_horizontal_bias', check_horizontal_bias, utils.check_horizontal_bias),
+        ('check_vertical_bias', check_vertical_bias, utils.check_vertical_bias),
+        ('filter_mask', filter_mask, utils.passes_all_filters),
+    ]
+
+    # 전체 조합 공간에서 무작위 표본 추출 (정렬되지 않은 순서로 섞어서 검증)
+    all_numbers = list(range(1, 46))
+    sample = [random.sample(all_numbers, 6) for _ in range(200_000)]
+    arr = as_combination_array(sample)
+
+    for name, vectorized, scalar in rules:
+        expected = np.array([bool(scalar(c)) for c in sample])
+        mismatches = int((vectorized(arr) != expected).sum())
+        status = '✓' if mismatches == 0 else '✗'
+        print(f"{status} {name}: {mismatches} mismatches / {len(sample):,}")
+
+    # 조합 공간 전체에 대한 비교 (비트맵과 대조)
+    from combination_index import FilterBitmap, all_combinations_array, rank_array
+
+    bitmap = FilterBitmap.load()
+    if bitmap is None:
+        print("filter_bitmap.bin not found; skipping full-space check.")
+        return
+
+    full = all_combinations_array()
+    bits = np.unpackbits(np.frombuffer(bitmap.bits, dtype=np.uint8), bitorder='little')
+    expected = bits[rank_array(full)].astype(bool)
+    mismatches = int((filter_mask(full) != expected).sum())
+    print(f"{'✓' if mismatches == 0 else '✗'} full 45C6 space: {mismatches} mismatches")
+
+
+if __name__ == '__main__':
+    main()
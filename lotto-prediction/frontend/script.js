@@ -14,6 +14,7 @@ let currentUser = null;
 let authToken = null;
 let savedCombinations = [];
 let currentPage = 'main'; // 'main' or 'mypage'
+let nextDrawNumber = 1203; // 생성 응답의 draw_number(다음 회차)로 갱신
 
 // DOM Elements
 const elements = {
@@ -268,15 +269,24 @@ async function generateCombinations() {
     elements.loading.classList.add('active');
 
     try {
+        // 로그인 상태면 토큰을 보내 이미 받았거나 저장한 조합을 제외
+        const headers = { 'Content-Type': 'application/json' };
+        if (authToken) {
+            headers['Authorization'] = `Bearer ${authToken}`;
+        }
+
         const response = await fetch(`${API_URL}/generate`, {
             method: 'POST',
-            headers: { 'Content-Type': 'application/json' },
+            headers,
             body: JSON.stringify({ num_combinations: numCombinations })
         });
 
         const data = await response.json();
 
         if (data.success) {
+            if (data.data.draw_number) {
+                nextDrawNumber = data.data.draw_number;
+            }
             displayResults(data.data);
         } else {
             alert('번호 생성 실패: ' + data.error);
@@ -394,8 +404,8 @@ async function saveCombination(numbers, btnElement) {
         return;
     }
 
-    // Get next draw number (임시로 1203 사용, 실제로는 현재 회차 + 1)
-    const drawNumber = 1203;
+    // 다음 회차 (마지막 생성 응답 기준)
+    const drawNumber = nextDrawNumber;
 
     try {
         const response = await fetch(`${API_URL}/combinations/save`, {